@@ -3,17 +3,39 @@ import tkinter
 import tkinter.messagebox
 import sys
 import os
+import io
+import shutil
+import zipfile
+import bisect
+import copy
+import hashlib
+import pickle
+import ast
+import time
+import queue
+import threading
+import json
+import re
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from collections import namedtuple, defaultdict
 from datetime import datetime
+from xml.sax.saxutils import escape as xml_escape
 
 # --- CRASH REPORTER WRAPPER ---
 try:
+    import numpy as np
     import customtkinter as ctk
     from docx import Document
-    from docx.shared import Pt, RGBColor, Cm
+    from docx.shared import Pt, RGBColor, Cm, Emu
     from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.enum.style import WD_STYLE_TYPE
     from docx.enum.table import WD_ROW_HEIGHT_RULE, WD_ALIGN_VERTICAL
     from docx.oxml.ns import nsdecls
     from docx.oxml import parse_xml
+    from docx.blkcntnr import BlockItemContainer
+    from lxml import etree
     from PIL import Image
 
     # ==========================================
@@ -197,9 +219,1348 @@ try:
 
         # Sort for safety
         pricelist_data.sort(key=lambda x: x['max_distance'])
-        
+
         return pricelist_data, fitout_packages, None
 
+    # ==========================================
+    # PART 1A: EXCEL PRICELIST + SNAPSHOT CACHE
+    # ==========================================
+
+    # Set to a workbook path (e.g. "master_pricelist.xlsx") to price from Excel
+    # instead of the hard-coded tables above. Relative paths are next to this script.
+    PRICELIST_XLSX = None
+
+    # Bump when the snapshot layout changes so old caches are rebuilt
+    CATALOG_CACHE_FORMAT = 3
+
+    # One typed record per pricelist row (columns A-L of master_pricelist.xlsx)
+    CatalogRow = namedtuple("CatalogRow", [
+        "row_number", "max_distance", "tier_name", "vc_items", "display_model", "display_price",
+        "mount_model", "mount_price", "cables_desc", "cables_price", "service_price", "ms_price", "extras"
+    ])
+
+    # One Fit-Out extra line item. Same field order as the old (Category, Name, Price, Qty) tuples,
+    # so item[2] * item[3] etc. still work, but parsed once at load and stored without a dict per item.
+    ExtraItem = namedtuple("ExtraItem", ["category", "name", "price", "qty"])
+
+    def parse_extras_string(extras_str):
+        """
+        Parses the legacy 'Name|Cost|Qty; Name|Cost|Qty' column into ExtraItems.
+        """
+        extras = []
+        for g in extras_str.split(';'):
+            if not g.strip(): continue
+            parts = g.split('|')
+            try:
+                extras.append(ExtraItem("Hardware", parts[0].strip(), float(parts[1]), int(parts[2])))
+            except (IndexError, ValueError):
+                raise ValueError(f"Extra item '{g.strip()}' is not Name|Cost|Qty")
+        return extras
+
+    def package_extras_total(pkg):
+        """
+        Cost of a Fit-Out package's extra items. Uses the value precomputed at load when present.
+        """
+        if 'extras_total' in pkg:
+            return pkg['extras_total']
+        return sum([item[2] * item[3] for item in pkg['items']])
+
+    def prepare_fitout_packages(fitout_packages):
+        """
+        Converts every package's extras to ExtraItems and precomputes the extras rollup,
+        so pricing never walks the item list again.
+        """
+        for pkg in fitout_packages.values():
+            pkg['items'] = [item if isinstance(item, ExtraItem) else ExtraItem(*item) for item in pkg['items']]
+            pkg['extras_total'] = sum([item.price * item.qty for item in pkg['items']])
+        return fitout_packages
+
+    def parse_pricelist_row(row_number, row):
+        """
+        Converts one raw worksheet row into a CatalogRow.
+        Raises ValueError naming the bad column so the loader can report it and move on.
+        """
+        row = tuple(row) + (None,) * (12 - len(row))
+
+        def money(col, label):
+            try:
+                return float(row[col] or 0)
+            except (TypeError, ValueError):
+                raise ValueError(f"{label} '{row[col]}' is not a number")
+
+        if not row[1]:
+            raise ValueError("Tier Name is blank")
+
+        return CatalogRow(
+            row_number, money(0, "Max Distance"), str(row[1]), str(row[2]) if row[2] else "",
+            str(row[3]), money(4, "Display Price"), str(row[5]), money(6, "Mount Price"),
+            str(row[7]), money(8, "Cables Price"), money(9, "Service Price"), money(10, "MS Annual Price"),
+            parse_extras_string(str(row[11])) if row[11] else []
+        )
+
+    def iter_pricelist_rows(sheet, row_errors):
+        """
+        Streams CatalogRows from a sheet of a workbook opened in openpyxl read-only mode.
+        Rows are parsed one at a time as the sheet is read, so memory stays flat however long
+        the sheet is. Malformed rows are appended to row_errors as (row_number, message).
+        """
+        for row_number, row in enumerate(sheet.iter_rows(min_row=2, values_only=True), start=2):
+            if not row or (row[0] is None and (len(row) < 2 or row[1] is None)): continue
+            try:
+                yield parse_pricelist_row(row_number, row)
+            except ValueError as e:
+                row_errors.append((row_number, str(e)))
+
+    def read_extras_sheet(sheet, row_errors):
+        """
+        Reads the typed 'Extras' sheet (Package | Category | Item | Unit Cost | Qty).
+        Returns {package name: [ExtraItem, ...]}.
+        """
+        extras_by_pkg = {}
+        for row_number, row in enumerate(sheet.iter_rows(min_row=2, max_col=5, values_only=True), start=2):
+            if not row or row[0] is None: continue
+            try:
+                item = ExtraItem(str(row[1] or "Hardware"), str(row[2]), float(row[3]), int(row[4]))
+            except (TypeError, ValueError):
+                row_errors.append((row_number, f"Extras sheet: '{row[2]}' needs a numeric Unit Cost and Qty"))
+                continue
+            extras_by_pkg.setdefault(str(row[0]), []).append(item)
+        return extras_by_pkg
+
+    def parse_pricelist_workbook(file_path):
+        """
+        Reads a master_pricelist.xlsx layout workbook (see generate_master_pricelist.py).
+        1. Builds the standard PRICELIST_DATA list for Data#3 logic.
+        2. Builds the FITOUT_PACKAGES dictionary dynamically for Fit-Out logic.
+        Returns (pricelist_data, fitout_packages, row_errors).
+        """
+        import openpyxl # Only needed on a cold start - warm starts load the snapshot
+
+        pricelist_data = []
+        fitout_packages = {}
+        row_errors = []
+
+        wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            extras_by_pkg = read_extras_sheet(wb["Extras"], row_errors) if "Extras" in wb.sheetnames else {}
+
+            for rec in iter_pricelist_rows(wb.worksheets[0], row_errors):
+                # --- FIT-OUT PACKAGE ---
+                if "Fit-Out" in rec.tier_name:
+                    fitout_packages[rec.tier_name] = {
+                        "max_distance": rec.max_distance,
+                        "display": ("Visual Display", rec.display_model, rec.display_price),
+                        "mount": ("Mounting", rec.mount_model, rec.mount_price),
+                        "vc": ("Video Conf", rec.vc_items, 3900.00),
+                        "cables": ("Cabling", rec.cables_desc, rec.cables_price),
+                        "services": rec.service_price,
+                        "ms_price": rec.ms_price,
+                        "items": rec.extras + extras_by_pkg.get(rec.tier_name, [])
+                    }
+
+                # --- DATA#3 TIER ---
+                else:
+                    pricelist_data.append({
+                        "max_distance": rec.max_distance,
+                        "tier_name": rec.tier_name,
+                        "cisco_items": [x.strip() for x in rec.vc_items.split(',')],
+                        "display_model": rec.display_model,
+                        "display_price": rec.display_price,
+                        "mount_model": rec.mount_model,
+                        "mount_price": rec.mount_price,
+                        "cables_misc": rec.cables_desc,
+                        "cables_price": rec.cables_price,
+                        "service_price": rec.service_price,
+                        "ms_annual": rec.ms_price
+                    })
+        finally:
+            wb.close() # Read-only workbooks hold the file open until closed
+
+        pricelist_data.sort(key=lambda x: x['max_distance'])
+        return pricelist_data, prepare_fitout_packages(fitout_packages), row_errors
+
+    def describe_row_errors(row_errors):
+        if not row_errors:
+            return None
+        shown = "; ".join(f"row {n}: {msg}" for n, msg in row_errors[:3])
+        more = f" (+{len(row_errors) - 3} more)" if len(row_errors) > 3 else ""
+        return f"Skipped {len(row_errors)} malformed row(s) - {shown}{more}"
+
+    def file_sha256(file_path):
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def load_pricelist_and_packages(file_path):
+        """
+        Loads an Excel pricelist through a binary snapshot stored next to it (<workbook>.cache).
+
+        The snapshot is trusted while the workbook's mtime and size are unchanged. If they move,
+        the content hash decides: same bytes -> re-stamp the snapshot, new bytes -> re-parse.
+        Returns (pricelist_data, fitout_packages, error) like load_internal_data.
+        Malformed rows do not stop the load - they come back as a warning in error.
+        """
+        if not os.path.exists(file_path):
+            return [], {}, f"File '{os.path.basename(file_path)}' not found."
+
+        cache_path = file_path + ".cache"
+        st = os.stat(file_path)
+        snapshot = None
+
+        try:
+            with open(cache_path, "rb") as f:
+                snapshot = pickle.load(f)
+            if snapshot.get('format') != CATALOG_CACHE_FORMAT:
+                snapshot = None
+        except Exception:
+            snapshot = None
+
+        # --- WARM START: workbook untouched ---
+        if snapshot and snapshot['mtime_ns'] == st.st_mtime_ns and snapshot['size'] == st.st_size:
+            return snapshot['pricelist_data'], snapshot['fitout_packages'], describe_row_errors(snapshot['row_errors'])
+
+        digest = file_sha256(file_path)
+        if snapshot and snapshot['sha256'] == digest:
+            pricelist_data, fitout_packages = snapshot['pricelist_data'], snapshot['fitout_packages']
+            row_errors = snapshot['row_errors']
+        else:
+            # --- COLD START: parse the workbook ---
+            try:
+                pricelist_data, fitout_packages, row_errors = parse_pricelist_workbook(file_path)
+            except Exception as e:
+                return [], {}, str(e)
+
+        snapshot = {
+            "format": CATALOG_CACHE_FORMAT,
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+            "sha256": digest,
+            "pricelist_data": pricelist_data,
+            "fitout_packages": fitout_packages,
+            "row_errors": row_errors,
+        }
+        try:
+            # Write then rename so a half-written snapshot is never picked up
+            tmp_path = cache_path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except (OSError, pickle.PicklingError):
+            pass # Read-only folder - still works, just without the cache
+
+        return pricelist_data, fitout_packages, describe_row_errors(row_errors)
+
+    def resolve_pricelist_path(source=None):
+        source = source or PRICELIST_XLSX
+        if source and not os.path.isabs(source):
+            source = os.path.join(os.path.dirname(os.path.abspath(__file__)), source)
+        return source
+
+    def load_catalog_source(source=None):
+        """
+        Loads the Excel pricelist if one is configured, otherwise the hard-coded tables.
+        Falls back to the hard-coded tables (with the error) if the workbook cannot be read.
+        """
+        source = resolve_pricelist_path(source)
+        if not source:
+            return load_internal_data()
+
+        pricelist_data, fitout_packages, error = load_pricelist_and_packages(source)
+        if not pricelist_data and not fitout_packages:
+            pricelist_data, fitout_packages, _ = load_internal_data()
+            error = f"{error} (using built-in prices)"
+        return pricelist_data, fitout_packages, error
+
+    # ==========================================
+    # PART 1B: COMPILED CATALOG & TIER INDEX
+    # ==========================================
+
+    def extract_screen_size(name):
+        """
+        Pulls the screen size out of a tier / package name, e.g. '6P Meeting (55")' -> '55"'.
+        """
+        if "(" in name and ")" in name and "\"" in name:
+            return name.split("(")[1].split(")")[0]
+        for size in ("55", "65", "75", "86", "98"):
+            if size in name:
+                return size + "\""
+        return "Unknown"
+
+    def build_tier_index(pricelist_data, fitout_packages):
+        """
+        Builds the distance -> tier index for both catalogs.
+        Each mode holds its tiers sorted by max_distance plus the matching array of
+        upper bounds, so a lookup is a binary search instead of a scan of the tiers,
+        and the tiers' prices as int64 cent columns (see tier_cent_columns).
+        """
+        sorted_tiers = sorted(pricelist_data, key=lambda x: x['max_distance'])
+        sorted_pkgs = sorted(fitout_packages.items(), key=lambda x: x[1]['max_distance'])
+
+        index = {}
+        for mode, keys, tiers in (
+            ("Data#3 (Cisco)", [t['tier_name'] for t in sorted_tiers], sorted_tiers),
+            ("Fit-Out (Full Scope)", [k for k, v in sorted_pkgs], [v for k, v in sorted_pkgs]),
+        ):
+            bounds = [float(t['max_distance']) for t in tiers]
+            index[mode] = {
+                "keys": keys,
+                "tiers": tiers,
+                "bounds": bounds,
+                "bounds_array": np.array(bounds, dtype=float),
+                "screen_sizes": [extract_screen_size(k) for k in keys],
+                **tier_cent_columns(tiers),
+            }
+        return index
+
+    def get_tier_band(tier_index, project_mode):
+        if project_mode == "Data#3 (Cisco)":
+            return tier_index["Data#3 (Cisco)"]
+        return tier_index["Fit-Out (Full Scope)"]
+
+    def lookup_tier(tier_index, project_mode, distance):
+        """
+        Returns (key, tier) for the smallest tier covering the distance,
+        or (None, None) if the distance is beyond the largest tier.
+        """
+        band = get_tier_band(tier_index, project_mode)
+        pos = bisect.bisect_left(band['bounds'], distance)
+        if pos >= len(band['bounds']):
+            return None, None
+        return band['keys'][pos], band['tiers'][pos]
+
+    def lookup_tiers(tier_index, project_mode, distances):
+        """
+        Vectorised lookup for bulk imports.
+        Returns an int array of tier positions into band['tiers'] (-1 = out of range).
+        """
+        band = get_tier_band(tier_index, project_mode)
+        distances = np.asarray(distances, dtype=float)
+        pos = np.searchsorted(band['bounds_array'], distances, side='left')
+        pos[(pos >= len(band['bounds'])) | np.isnan(distances)] = -1
+        return pos
+
+    def compute_catalog_version(pricelist_data, fitout_packages):
+        """
+        Content hash of a catalog. Any price or description change gives a new version,
+        which is what invalidates the rollup cache.
+        """
+        return hashlib.sha1(pickle.dumps((pricelist_data, fitout_packages), protocol=4)).hexdigest()[:12]
+
+    def compile_catalog(pricelist_data, fitout_packages):
+        """
+        Bundles the raw catalog with everything derived from it at load time.
+        """
+        fitout_packages = prepare_fitout_packages(fitout_packages)
+        return {
+            "pricelist_data": pricelist_data,
+            "fitout_packages": fitout_packages,
+            "version": compute_catalog_version(pricelist_data, fitout_packages),
+            "tier_index": build_tier_index(pricelist_data, fitout_packages),
+            "sku_index": build_sku_index(pricelist_data, fitout_packages),
+        }
+
+    def make_room_entry(project_mode, name, distance, key, tier):
+        """
+        Builds an ADDED_ROOMS entry for a tier returned by the index.
+        """
+        room_entry = {'name': name, 'distance': distance}
+        if project_mode == "Data#3 (Cisco)":
+            room_entry['type'] = tier['tier_name']
+            room_entry['config'] = tier
+        else:
+            # Type must carry the package name - generation keys off "Fit-Out" in it
+            room_entry['type'] = key
+            room_entry['pkg_key'] = key
+            room_entry['config'] = None
+        return room_entry
+
+    def make_room_entries(catalog, project_mode, names, distances):
+        """
+        Bulk version of make_room_entry for surveyed room lists.
+        Returns (rooms, rejected) where rejected holds names beyond the largest tier.
+        """
+        band = get_tier_band(catalog['tier_index'], project_mode)
+        positions = lookup_tiers(catalog['tier_index'], project_mode, distances)
+        rooms, rejected = [], []
+        for name, dist, pos in zip(names, distances, positions.tolist()):
+            if pos < 0:
+                rejected.append(name)
+                continue
+            rooms.append(make_room_entry(project_mode, name, float(dist), band['keys'][pos], band['tiers'][pos]))
+        return rooms, rejected
+
+    # ==========================================
+    # PART 1C: VECTORISED PRICING ENGINE
+    # ==========================================
+
+    # --- MONEY ---
+    # All pricing maths runs on integer cents (Python int / NumPy int64) so totals are exact
+    # however many lines are added up. Catalog prices stay in dollars and are converted on the
+    # way in - whole tier bands at once into the tier index, single tiers through compute_rollup;
+    # format_cents() is the only way back out to text.
+
+    def to_cents(dollars):
+        return int(round(float(dollars) * 100))
+
+    def to_cents_array(dollars):
+        return np.rint(np.asarray(dollars, dtype=float) * 100).astype(np.int64)
+
+    def tier_cent_columns(tiers):
+        """
+        A band's prices as int64 cent columns, converted once when the catalog is compiled:
+        display (per screen), the rest of the upfront cost and managed service p/a.
+        Upfront for q screens is display_cents * q + fixed_cents - the same figures as compute_rollup.
+        """
+        display, fixed, ms_annual = [], [], []
+        for tier in tiers:
+            if 'tier_name' in tier:
+                display.append(tier['display_price'])
+                fixed.append([tier['mount_price'], tier['cables_price'], tier['service_price'], 0, 0])
+                ms_annual.append(tier['ms_annual'])
+            else:
+                display.append(tier['display'][2])
+                fixed.append([tier['mount'][2], tier['vc'][2], tier['cables'][2], tier['services'], package_extras_total(tier)])
+                ms_annual.append(tier['ms_price'])
+        # Each component is rounded to cents on its own before summing, as compute_rollup does
+        fixed_cents = to_cents_array(np.reshape(np.asarray(fixed, dtype=float), (len(tiers), 5))).sum(axis=1)
+        return {
+            "display_cents": to_cents_array(display),
+            "fixed_cents": fixed_cents,
+            "ms_annual_cents": to_cents_array(ms_annual),
+        }
+
+    def format_cents(cents, places=2):
+        """
+        Formats integer cents like f"{dollars:,.2f}" / f"{dollars:,.0f}" without going through a float.
+        Whole-dollar rounding is half-to-even, the same as Python's float formatting.
+        """
+        cents = int(cents)
+        sign = "-" if cents < 0 else ""
+        dollars, rem = divmod(abs(cents), 100)
+        if places == 2:
+            return f"{sign}{dollars:,}.{rem:02d}"
+        if rem > 50 or (rem == 50 and dollars % 2 == 1):
+            dollars += 1
+        return f"{sign}{dollars:,}" if dollars else "0"
+
+    def resolve_room_package(room, fitout_pkgs):
+        """
+        Returns (package_id, tier) for a room - the Data#3 tier dict or Fit-Out package dict it is
+        priced from, plus a stable id for it. (None, None) if the Fit-Out package is missing.
+        """
+        r_type = room['type']
+        if "Fit-Out" in r_type:
+            pkg = fitout_pkgs.get(r_type)
+            if pkg:
+                return ("Fit-Out", r_type), pkg
+            if room.get('pkg_key') and fitout_pkgs.get(room['pkg_key']):
+                return ("Fit-Out", room['pkg_key']), fitout_pkgs[room['pkg_key']]
+            return None, None
+        return ("Data#3", room['config']['tier_name']), room['config']
+
+    def room_display_qty(room):
+        # Solver-assigned rooms carry their own qty; otherwise dual screen is a Fit-Out package option
+        if room.get('display_qty'):
+            return room['display_qty']
+        return 2 if "Fit-Out" in room['type'] and "Dual" in room['type'] else 1
+
+    def compute_rollup(tier, qty_display):
+        """
+        Upfront / managed service cost (integer cents) of one room on this tier.
+        Data#3 tiers have no VC or extras cost (Cisco is supplied by Data#3).
+        """
+        if 'tier_name' in tier:
+            upfront = (to_cents(tier['display_price']) * qty_display + to_cents(tier['mount_price'])
+                       + to_cents(tier['cables_price']) + to_cents(tier['service_price']))
+            return {
+                "upfront_cents": upfront,
+                "ms_annual_cents": to_cents(tier['ms_annual']),
+                "has_audio": bool(tier.get('has_audio_upgrade_option')),
+            }
+
+        upfront = (to_cents(tier['display'][2]) * qty_display + to_cents(tier['mount'][2]) + to_cents(tier['vc'][2])
+                   + to_cents(tier['cables'][2]) + to_cents(tier['services']) + to_cents(package_extras_total(tier)))
+        return {
+            "upfront_cents": upfront,
+            "ms_annual_cents": to_cents(tier['ms_price']),
+            "has_audio": 'audio_upgrade' in tier,
+        }
+
+    # Rollups for the current catalog version: {(package_id, qty_display): rollup}
+    ROLLUP_CACHE = {"version": None, "rollups": {}}
+
+    def get_package_rollup(package_id, tier, qty_display, catalog_version=None):
+        """
+        Memoised compute_rollup shared by the room list preview, the summary table and batch runs.
+        The cache is dropped as soon as a rollup is requested for a different catalog version.
+        Without a catalog_version (ad-hoc package dicts) the rollup is computed uncached.
+        """
+        if catalog_version is None:
+            return compute_rollup(tier, qty_display)
+
+        if ROLLUP_CACHE['version'] != catalog_version:
+            ROLLUP_CACHE['version'] = catalog_version
+            ROLLUP_CACHE['rollups'] = {}
+
+        key = (package_id, qty_display)
+        rollup = ROLLUP_CACHE['rollups'].get(key)
+        if rollup is None:
+            rollup = compute_rollup(tier, qty_display)
+            ROLLUP_CACHE['rollups'][key] = rollup
+        return rollup
+
+    def price_project(room_list, fitout_pkgs, catalog_version=None):
+        """
+        Prices a whole room list in one vectorised pass. All amounts are int64 cents.
+
+        Rooms are reduced to a column of (package, display qty) ids. Each distinct id is rolled up
+        once (memoised per catalog version) and the per-room figures are a single gather,
+        so the maths is the same for 5 rooms or 5,000.
+        Rooms whose package cannot be found are flagged invalid and left out of the totals.
+        """
+        n = len(room_list)
+        rollups = []
+        rollup_ids = {}
+        ids = np.full(n, -1, dtype=np.int64)
+
+        for i, room in enumerate(room_list):
+            package_id, tier = resolve_room_package(room, fitout_pkgs)
+            if not tier:
+                continue
+            key = (package_id, room_display_qty(room))
+            if key not in rollup_ids:
+                rollup_ids[key] = len(rollups)
+                rollups.append(get_package_rollup(package_id, tier, key[1], catalog_version))
+            ids[i] = rollup_ids[key]
+
+        valid = ids >= 0
+        safe_ids = np.where(valid, ids, 0)
+
+        if rollups:
+            upfront = np.array([r['upfront_cents'] for r in rollups], dtype=np.int64)[safe_ids]
+            ms_annual = np.array([r['ms_annual_cents'] for r in rollups], dtype=np.int64)[safe_ids]
+            has_audio = np.array([r['has_audio'] for r in rollups], dtype=bool)[safe_ids] & valid
+        else:
+            upfront = np.zeros(n, dtype=np.int64)
+            ms_annual = np.zeros(n, dtype=np.int64)
+            has_audio = np.zeros(n, dtype=bool)
+
+        upfront = np.where(valid, upfront, 0)
+        ms_annual = np.where(valid, ms_annual, 0)
+        total_y1 = upfront + ms_annual
+
+        return {
+            "rollup_ids": ids,
+            "valid": valid,
+            "upfront_cents": upfront,
+            "ms_annual_cents": ms_annual,
+            "total_y1_cents": total_y1,
+            "upfront_total_cents": int(upfront.sum()),
+            "ms_total_cents": int(ms_annual.sum()),
+            "grand_total_cents": int(total_y1.sum()),
+            # Every room gets a booking panel option
+            "qty_booking_panels": n,
+            "qty_audio_upgrades": int(has_audio.sum()),
+        }
+
+    # ==========================================
+    # PART 1D: CATALOG HOT-RELOAD
+    # ==========================================
+
+    def load_internal_data_from_script(script_path):
+        """
+        Re-reads load_internal_data() from the script on disk without running the rest of it,
+        so edits to the hard-coded price tables can be picked up by a running session.
+        """
+        with open(script_path, encoding="utf-8") as f:
+            tree = ast.parse(f.read(), filename=script_path)
+
+        for node in ast.walk(tree):
+            if isinstance(node, ast.FunctionDef) and node.name == "load_internal_data":
+                namespace = {}
+                exec(compile(ast.Module(body=[node], type_ignores=[]), script_path, "exec"), namespace)
+                return namespace["load_internal_data"]()
+        raise ValueError(f"No load_internal_data() found in {os.path.basename(script_path)}")
+
+    def catalog_watch_path():
+        # The workbook when pricing from Excel, otherwise this script (hard-coded tables)
+        return resolve_pricelist_path() or os.path.abspath(__file__)
+
+    def file_stamp(path):
+        try:
+            st = os.stat(path)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def reload_catalog():
+        """
+        Builds a fresh compiled catalog from the current source. Safe to call off the UI thread:
+        it only reads files and returns new objects, nothing shared is touched.
+        Returns (catalog, error). catalog is None if the source could not be loaded.
+        """
+        xlsx = resolve_pricelist_path()
+        if xlsx:
+            pricelist_data, fitout_packages, error = load_pricelist_and_packages(xlsx)
+            if not pricelist_data and not fitout_packages:
+                return None, error
+        else:
+            pricelist_data, fitout_packages, error = load_internal_data_from_script(os.path.abspath(__file__))
+        return compile_catalog(pricelist_data, fitout_packages), error
+
+    def start_catalog_watcher(updates, interval=2.0):
+        """
+        Background thread that polls the pricelist source and, when it changes, rebuilds the
+        catalog and puts (catalog, error) on the updates queue for the UI thread to swap in.
+        """
+        def watch():
+            last_stamp = file_stamp(catalog_watch_path())
+            while True:
+                time.sleep(interval)
+                path = catalog_watch_path()
+                stamp = file_stamp(path)
+                if stamp is None or stamp == last_stamp:
+                    continue
+                last_stamp = stamp
+                try:
+                    updates.put(reload_catalog())
+                except Exception as e:
+                    updates.put((None, f"{os.path.basename(path)}: {e}"))
+
+        thread = threading.Thread(target=watch, name="catalog-watcher", daemon=True)
+        thread.start()
+        return thread
+
+    def rebind_room(room, catalog):
+        """
+        Points an existing room at the matching tier of a new catalog - by name first, then by
+        its furthest-participant distance if the tier was renamed. Returns False if no tier fits.
+        """
+        if "Fit-Out" in room['type']:
+            key = room.get('pkg_key', room['type'])
+            if key in catalog['fitout_packages']:
+                return True
+            key, tier = lookup_tier(catalog['tier_index'], "Fit-Out (Full Scope)", room['distance'])
+        else:
+            for tier in catalog['pricelist_data']:
+                if tier['tier_name'] == room['type']:
+                    room['config'] = tier
+                    return True
+            key, tier = lookup_tier(catalog['tier_index'], "Data#3 (Cisco)", room['distance'])
+
+        if tier is None:
+            return False
+        mode = "Data#3 (Cisco)" if 'tier_name' in tier else "Fit-Out (Full Scope)"
+        room.update(make_room_entry(mode, room['name'], room['distance'], key, tier))
+        return True
+
+    # ==========================================
+    # PART 1E: RUNNING PROJECT TOTALS
+    # ==========================================
+
+    def new_project_totals(catalog_version=None):
+        return {
+            "catalog_version": catalog_version,
+            "rooms": 0,
+            "upfront_cents": 0,
+            "ms_annual_cents": 0,
+            "booking_panels": 0,
+            "audio_upgrades": 0,
+        }
+
+    def add_room_to_totals(totals, room, fitout_pkgs):
+        """
+        O(1) update when a room is added. The room keeps the rollup it contributed,
+        so removing it later takes back exactly what was added.
+        """
+        package_id, tier = resolve_room_package(room, fitout_pkgs)
+        if tier:
+            rollup = get_package_rollup(package_id, tier, room_display_qty(room), totals['catalog_version'])
+        else:
+            rollup = None
+        room['rollup'] = rollup
+
+        totals['rooms'] += 1
+        totals['booking_panels'] += 1 # Every room gets a booking panel option
+        if rollup:
+            totals['upfront_cents'] += rollup['upfront_cents']
+            totals['ms_annual_cents'] += rollup['ms_annual_cents']
+            totals['audio_upgrades'] += 1 if rollup['has_audio'] else 0
+
+    def remove_room_from_totals(totals, room):
+        rollup = room.get('rollup')
+        totals['rooms'] -= 1
+        totals['booking_panels'] -= 1
+        if rollup:
+            totals['upfront_cents'] -= rollup['upfront_cents']
+            totals['ms_annual_cents'] -= rollup['ms_annual_cents']
+            totals['audio_upgrades'] -= 1 if rollup['has_audio'] else 0
+
+    def rebuild_project_totals(room_list, fitout_pkgs, catalog_version):
+        # Only needed when the catalog itself changes (hot reload)
+        totals = new_project_totals(catalog_version)
+        for room in room_list:
+            add_room_to_totals(totals, room, fitout_pkgs)
+        return totals
+
+    def pricing_from_totals(room_list, totals):
+        """
+        Builds the price_project() result from running totals and the rollups stored on each
+        room, skipping the pricing pass. Returns None if the totals do not match the room list,
+        in which case the caller should fall back to price_project().
+        """
+        if totals is None or totals['rooms'] != len(room_list):
+            return None
+        if any('rollup' not in room for room in room_list):
+            return None
+
+        valid = np.array([room['rollup'] is not None for room in room_list], dtype=bool)
+        upfront = np.array([room['rollup']['upfront_cents'] if room['rollup'] else 0 for room in room_list], dtype=np.int64)
+        ms_annual = np.array([room['rollup']['ms_annual_cents'] if room['rollup'] else 0 for room in room_list], dtype=np.int64)
+
+        return {
+            "valid": valid,
+            "upfront_cents": upfront,
+            "ms_annual_cents": ms_annual,
+            "total_y1_cents": upfront + ms_annual,
+            "upfront_total_cents": totals['upfront_cents'],
+            "ms_total_cents": totals['ms_annual_cents'],
+            "grand_total_cents": totals['upfront_cents'] + totals['ms_annual_cents'],
+            "qty_booking_panels": totals['booking_panels'],
+            "qty_audio_upgrades": totals['audio_upgrades'],
+        }
+
+    # ==========================================
+    # PART 1F: MANAGED SERVICE 5-YEAR PROJECTION
+    # ==========================================
+
+    # MSA terms (see the Managed Service Agreement wording in the proposal)
+    MSA_TERM_YEARS = 5
+    MSA_MIN_INCREASE = 0.04 # Annual billing rises by 4% or CPI, whichever is greater
+
+    def project_msa_schedules(ms_annual_cents, cpi_scenarios=None):
+        """
+        Five-year managed service cash flow for both billing options, for every CPI scenario at once.
+
+        ms_annual_cents: Year 1 price per room (int cents).
+        cpi_scenarios: CPI per scenario, either one rate each (applied every year) or a row of
+                       MSA_TERM_YEARS - 1 rates (years 2-5). None = CPI at or under the 4% floor.
+
+        Annual billing compounds max(4%, CPI) each year, rounded to the cent per room per year.
+        The 60-month upfront option is Year 1 x 5 paid in Year 1 with no increase.
+        Rooms are grouped by Year 1 price first, so the work scales with the number of distinct
+        prices x scenarios, not rooms x scenarios.
+        """
+        ms_annual_cents = np.asarray(ms_annual_cents, dtype=np.int64)
+        cpi = np.zeros((1, MSA_TERM_YEARS - 1)) if cpi_scenarios is None else np.asarray(cpi_scenarios, dtype=float)
+        if cpi.ndim == 1:
+            cpi = np.repeat(cpi[:, None], MSA_TERM_YEARS - 1, axis=1)
+
+        increases = 1.0 + np.maximum(cpi, MSA_MIN_INCREASE) # (scenarios, years 2-5)
+        prices, inverse, counts = np.unique(ms_annual_cents, return_inverse=True, return_counts=True)
+
+        # (scenarios, distinct prices, years)
+        by_price = np.empty((cpi.shape[0], len(prices), MSA_TERM_YEARS), dtype=np.int64)
+        by_price[:, :, 0] = prices
+        for year in range(1, MSA_TERM_YEARS):
+            by_price[:, :, year] = np.rint(by_price[:, :, year - 1] * increases[:, year - 1][:, None])
+
+        annual_project = np.einsum('spy,p->sy', by_price, counts) # (scenarios, years)
+        upfront_project = np.zeros(MSA_TERM_YEARS, dtype=np.int64)
+        upfront_project[0] = int(ms_annual_cents.sum()) * MSA_TERM_YEARS
+
+        return {
+            "inverse": inverse,
+            "annual_by_price": by_price,
+            "annual_project": annual_project,
+            "annual_total": annual_project.sum(axis=1),
+            "upfront_project": upfront_project,
+            "upfront_total": int(upfront_project.sum()),
+        }
+
+    def room_msa_schedules(projection, scenario=0):
+        # Per-room (rooms, years) annual billing schedule for one scenario
+        return projection['annual_by_price'][scenario][projection['inverse']]
+
+    # ==========================================
+    # PART 1G: WHAT-IF REPRICING ACROSS CATALOGS
+    # ==========================================
+
+    def load_catalog_file(path):
+        """
+        Loads a catalog from any of the forms we keep price lists in:
+        a quoter script (.py, e.g. alder_quoterV47.py), a pricelist workbook (.xlsx)
+        or a workbook snapshot (.cache). Returns a compiled catalog.
+        """
+        ext = os.path.splitext(path)[1].lower()
+        if ext == ".py":
+            pricelist_data, fitout_packages, _ = load_internal_data_from_script(path)
+        elif ext == ".xlsx":
+            pricelist_data, fitout_packages, error = load_pricelist_and_packages(path)
+            if not pricelist_data and not fitout_packages:
+                raise ValueError(error)
+        elif ext == ".cache":
+            with open(path, "rb") as f:
+                snapshot = pickle.load(f)
+            pricelist_data, fitout_packages = snapshot['pricelist_data'], snapshot['fitout_packages']
+        else:
+            raise ValueError(f"Unsupported catalog file: {os.path.basename(path)}")
+        return compile_catalog(pricelist_data, fitout_packages)
+
+    def parse_survey_flag(value):
+        return str(value).strip().lower() in ("1", "y", "yes", "true", "x")
+
+    def load_survey_file(path):
+        """
+        Reads a surveyed room list.
+        JSON: [{"name": ..., "distance": ..., "acoustic_risk": ..., "dual_screen": ...}, ...]
+        CSV / text: one 'Name, Distance[, Acoustic Risk][, Dual Screen]' per line (Excel paste
+        with tabs also works). Flags are Y/N, 1/0 or blank.
+        Returns a list of {'name', 'distance', 'acoustic_risk', 'dual_screen'} dicts.
+        """
+        survey = []
+        if path.lower().endswith(".json"):
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            for room in (data.get('rooms', []) if isinstance(data, dict) else data):
+                survey.append({
+                    "name": str(room['name']),
+                    "distance": float(str(room['distance']).lower().replace('m', '')),
+                    "acoustic_risk": parse_survey_flag(room.get('acoustic_risk', False)),
+                    "dual_screen": parse_survey_flag(room.get('dual_screen', False)),
+                })
+            return survey
+
+        with open(path, encoding="utf-8-sig") as f:
+            for line in f:
+                line = line.strip().replace("\t", ",")
+                if not line or "," not in line: continue
+                parts = [p.strip() for p in line.split(',')] + ["", ""]
+                try:
+                    dist = float(parts[1].lower().replace('m', ''))
+                except ValueError:
+                    continue # Header row / distance isn't a number
+                survey.append({
+                    "name": parts[0],
+                    "distance": dist,
+                    "acoustic_risk": parse_survey_flag(parts[2]),
+                    "dual_screen": parse_survey_flag(parts[3]),
+                })
+        return survey
+
+    def load_room_file(path):
+        """
+        Names and distances only of a surveyed room list (see load_survey_file).
+        Returns (names, distances).
+        """
+        survey = load_survey_file(path)
+        return [r['name'] for r in survey], [r['distance'] for r in survey]
+
+    def reprice_on_catalog(job):
+        """
+        Process-pool worker: prices one room list against one catalog source.
+        Rooms are matched to tiers by distance, since tier names change between price lists.
+        Returns int64 cents per room (0 where no tier covers the distance).
+        """
+        source, project_mode, distances = job
+        catalog = load_catalog_file(source)
+        band = get_tier_band(catalog['tier_index'], project_mode)
+        positions = lookup_tiers(catalog['tier_index'], project_mode, distances)
+
+        tier_upfront = np.append(band['display_cents'] + band['fixed_cents'], 0)
+        tier_ms = np.append(band['ms_annual_cents'], 0)
+
+        # -1 (no tier) picks the trailing zero
+        return {
+            "source": source,
+            "version": catalog['version'],
+            "tier_keys": [band['keys'][p] if p >= 0 else None for p in positions.tolist()],
+            "upfront_cents": tier_upfront[positions],
+            "ms_annual_cents": tier_ms[positions],
+        }
+
+    def compare_catalogs(distances, sources, project_mode, max_workers=None):
+        """
+        Reprices one room list against N catalog versions in parallel worker processes.
+        Returns the comparison matrix (one row of totals per catalog) plus per-room Year 1
+        deltas against the first catalog.
+        """
+        distances = np.asarray(distances, dtype=float)
+        jobs = [(source, project_mode, distances) for source in sources]
+
+        if len(jobs) > 1 and max_workers != 1:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                results = list(pool.map(reprice_on_catalog, jobs))
+        else:
+            results = [reprice_on_catalog(job) for job in jobs]
+
+        upfront = np.vstack([r['upfront_cents'] for r in results]) # (catalogs, rooms)
+        ms_annual = np.vstack([r['ms_annual_cents'] for r in results])
+        total_y1 = upfront + ms_annual
+
+        return {
+            "sources": list(sources),
+            "results": results,
+            # Columns: upfront, managed service p/a, Year 1 - one row per catalog
+            "matrix": np.stack([upfront.sum(axis=1), ms_annual.sum(axis=1), total_y1.sum(axis=1)], axis=1),
+            "per_room_y1": total_y1,
+            "per_room_delta": total_y1 - total_y1[0],
+        }
+
+    # ==========================================
+    # PART 1H: COST-OPTIMAL TIER ASSIGNMENT
+    # ==========================================
+
+    SOLVER_MAX_NODES = 200000 # Search budget before settling for the best standardisation found
+    SOLVER_UNCOVERED = 1e12 # Cents charged for a room no chosen display model can serve
+
+    def tier_display_model(tier):
+        return tier['display_model'] if 'tier_name' in tier else tier['display'][1]
+
+    def tier_audio_upgrade_cents(tier):
+        """
+        Price of the premium audio option on a tier, or None if the tier has no audio option.
+        """
+        if 'tier_name' in tier:
+            if not tier.get('has_audio_upgrade_option'):
+                return None
+            return to_cents(tier.get('audio_upgrade_price', 10078.00))
+        if 'audio_upgrade' in tier:
+            return to_cents(tier['audio_upgrade']['total_price'])
+        return None
+
+    def build_solver_costs(band, class_pos, class_acoustic, class_dual):
+        """
+        Year 1 cost (cents, as float so infeasible = inf) of every room class on every tier.
+        A tier is compliant if it covers the class's distance, offers the audio option when the
+        room has acoustic risk (the option is then costed in) and can take a second display.
+        """
+        tiers = band['tiers']
+        qty = np.array([[1], [2]]) # (display qty 1 / 2, tiers)
+        y1 = (band['display_cents'] * qty + band['fixed_cents'] + band['ms_annual_cents']).astype(float)
+        audio = np.full(len(tiers), np.inf)
+        for t, tier in enumerate(tiers):
+            upgrade = tier_audio_upgrade_cents(tier)
+            if upgrade is not None:
+                audio[t] = upgrade
+
+        costs = y1[class_dual.astype(int)] # (classes, tiers)
+        costs = costs + np.where(class_acoustic[:, None], audio[None, :], 0.0)
+        covers = np.arange(len(tiers))[None, :] >= class_pos[:, None]
+        return np.where(covers, costs, np.inf)
+
+    def choose_display_models(model_costs, counts, max_models):
+        """
+        Picks at most max_models display models (columns) minimising sum(counts * cheapest chosen cost).
+        Depth-first branch and bound: models are tried best-first from a greedy starting point, and a
+        branch is cut as soon as even adding every remaining model could not beat the best set so far.
+        Returns (models, total, optimal) - optimal is False if the node budget ran out first.
+        """
+        n_classes, n_models = model_costs.shape
+        # A class none of the chosen models can serve costs SOLVER_UNCOVERED, so sets that leave
+        # rooms uncovered always lose to sets that don't
+        model_costs = np.where(np.isfinite(model_costs), model_costs, SOLVER_UNCOVERED)
+
+        # Greedy start: repeatedly add whichever model saves the most
+        current = np.full(n_classes, SOLVER_UNCOVERED)
+        best_set = []
+        for _ in range(min(max_models, n_models)):
+            totals = counts @ np.minimum(current[:, None], model_costs)
+            pick = int(np.argmin(totals))
+            if pick in best_set or totals[pick] >= counts @ current:
+                break
+            best_set.append(pick)
+            current = np.minimum(current, model_costs[:, pick])
+        best_total = counts @ current
+
+        # Search order: models the unconstrained optimum relies on most come first
+        weights = np.bincount(np.argmin(model_costs, axis=1), weights=counts, minlength=n_models)
+        order = np.argsort(-weights, kind='stable')
+        suffix_min = np.full((n_models + 1, n_classes), SOLVER_UNCOVERED)
+        for i in range(n_models - 1, -1, -1):
+            suffix_min[i] = np.minimum(suffix_min[i + 1], model_costs[:, order[i]])
+
+        nodes = 0
+        exhausted = False
+
+        def search(i, chosen, current):
+            nonlocal best_total, best_set, nodes, exhausted
+            nodes += 1
+            if nodes > SOLVER_MAX_NODES:
+                exhausted = True
+                return
+            if len(chosen) == max_models or i == n_models:
+                total = counts @ current
+                if total < best_total:
+                    best_total, best_set = total, list(chosen)
+                return
+            if counts @ np.minimum(current, suffix_min[i]) >= best_total:
+                return # Even every remaining model can't beat the best set
+            model = int(order[i])
+            chosen.append(model)
+            search(i + 1, chosen, np.minimum(current, model_costs[:, model]))
+            chosen.pop()
+            if not exhausted:
+                search(i + 1, chosen, current)
+
+        search(0, [], np.full(n_classes, SOLVER_UNCOVERED))
+        return sorted(best_set), best_total, not exhausted
+
+    def solve_tier_assignment(catalog, project_mode, distances, acoustic_risk=None, dual_screen=None, max_models=None):
+        """
+        Assigns every surveyed room the cheapest compliant tier (by Year 1 cost), optionally
+        standardising the project on at most max_models display models.
+
+        Rooms are first collapsed into requirement classes (smallest covering tier, acoustic risk,
+        dual screen) - a few dozen at most however many rooms there are - so the search runs on
+        a classes x display models cost matrix rather than on the rooms themselves.
+        Raises ValueError if no set of max_models display models covers every room.
+        """
+        band = get_tier_band(catalog['tier_index'], project_mode)
+        distances = np.asarray(distances, dtype=float)
+        n = len(distances)
+        acoustic = np.zeros(n, dtype=bool) if acoustic_risk is None else np.asarray(acoustic_risk, dtype=bool)
+        dual = np.zeros(n, dtype=bool) if dual_screen is None else np.asarray(dual_screen, dtype=bool)
+
+        positions = lookup_tiers(catalog['tier_index'], project_mode, distances)
+        class_keys = np.stack([positions, acoustic.astype(np.int64), dual.astype(np.int64)], axis=1)
+        classes, inverse, counts = np.unique(class_keys, axis=0, return_inverse=True, return_counts=True)
+        inverse = inverse.reshape(-1)
+
+        costs = build_solver_costs(band, classes[:, 0], classes[:, 1].astype(bool), classes[:, 2].astype(bool))
+        costs[classes[:, 0] < 0] = np.inf
+        feasible = np.isfinite(costs).any(axis=1) # Classes no tier can serve are reported, not solved
+
+        models = sorted(set(tier_display_model(t) for t in band['tiers']))
+        tier_model = np.array([models.index(tier_display_model(t)) for t in band['tiers']], dtype=np.int64)
+        model_costs = np.full((len(classes), len(models)), np.inf)
+        for m in range(len(models)):
+            if (tier_model == m).any():
+                model_costs[:, m] = costs[:, tier_model == m].min(axis=1)
+
+        solve_costs = model_costs[feasible]
+        solve_counts = counts[feasible].astype(float)
+        unconstrained = np.argmin(solve_costs, axis=1) if len(solve_costs) else np.array([], dtype=np.int64)
+        used = sorted(set(unconstrained.tolist()))
+        optimal = True
+        if max_models is not None and len(used) > max_models:
+            used, _, optimal = choose_display_models(solve_costs, solve_counts, max_models)
+            if not np.isfinite(solve_costs[:, used]).any(axis=1).all():
+                raise ValueError(f"No {max_models} display models cover every room - allow more models")
+
+        # Cheapest compliant tier per class among the chosen display models
+        allowed = np.isin(tier_model, used)
+        class_tier = np.argmin(np.where(allowed[None, :], costs, np.inf), axis=1)
+        class_tier[~feasible] = -1
+        room_tier = class_tier[inverse]
+
+        class_cost = np.where(feasible, costs[np.arange(len(classes)), np.maximum(class_tier, 0)], 0)
+        room_y1 = np.rint(class_cost[inverse]).astype(np.int64)
+        audio = np.array([tier_audio_upgrade_cents(t) or 0 for t in band['tiers']] + [0], dtype=np.int64)
+        room_audio = np.where(acoustic, audio[room_tier], 0)
+
+        return {
+            "tier_positions": room_tier,
+            "tier_keys": [band['keys'][p] if p >= 0 else None for p in room_tier.tolist()],
+            "display_models": [models[m] for m in used],
+            "y1_cents": room_y1, # Includes the audio option on acoustic-risk rooms
+            "audio_cents": room_audio,
+            "total_cents": int(room_y1.sum()),
+            "unconstrained_total_cents": int(np.rint(solve_counts @ solve_costs.min(axis=1))) if len(solve_costs) else 0,
+            "optimal": optimal,
+            "classes": len(classes),
+        }
+
+    def make_solved_room_entries(catalog, project_mode, survey, solution):
+        """
+        ADDED_ROOMS entries for a solved survey. Returns (rooms, rejected).
+        """
+        band = get_tier_band(catalog['tier_index'], project_mode)
+        rooms, rejected = [], []
+        for room, pos in zip(survey, solution['tier_positions'].tolist()):
+            if pos < 0:
+                rejected.append(room['name'])
+                continue
+            entry = make_room_entry(project_mode, room['name'], room['distance'], band['keys'][pos], band['tiers'][pos])
+            if room.get('dual_screen'):
+                entry['display_qty'] = 2
+            rooms.append(entry)
+        return rooms, rejected
+
+    # ==========================================
+    # PART 1I: DUAL-MODE (DATA#3 VS FIT-OUT) PRICING
+    # ==========================================
+
+    def price_dual_mode(catalog, distances, display_qty=None):
+        """
+        Prices one room list in both scopes in a single pass. Each room is matched by its
+        furthest-participant distance to the Data#3 tier and the Fit-Out package covering it,
+        so a project entered once can be quoted both ways.
+        Returns {mode: pricing} with tier keys, int64 cents per room (0 where nothing covers
+        the distance) and the totals for that scope.
+        """
+        distances = np.asarray(distances, dtype=float)
+        n = len(distances)
+        qty = np.ones(n, dtype=np.int64) if display_qty is None else np.clip(np.asarray(display_qty, dtype=np.int64), 1, 2)
+
+        result = {}
+        for project_mode in PROJECT_MODES:
+            band = get_tier_band(catalog['tier_index'], project_mode)
+            positions = lookup_tiers(catalog['tier_index'], project_mode, distances)
+
+            # (display qty 1 / 2, tiers + trailing 'no tier' column) so every room is one gather
+            upfront = np.zeros((2, len(band['tiers']) + 1), dtype=np.int64)
+            ms_annual = np.zeros((2, len(band['tiers']) + 1), dtype=np.int64)
+            upfront[:, :-1] = band['display_cents'] * np.array([[1], [2]]) + band['fixed_cents']
+            ms_annual[:, :-1] = band['ms_annual_cents']
+
+            room_upfront = upfront[qty - 1, positions]
+            room_ms = ms_annual[qty - 1, positions]
+            result[project_mode] = {
+                "tier_keys": [band['keys'][p] if p >= 0 else None for p in positions.tolist()],
+                "valid": positions >= 0,
+                "upfront_cents": room_upfront,
+                "ms_annual_cents": room_ms,
+                "total_y1_cents": room_upfront + room_ms,
+                "upfront_total_cents": int(room_upfront.sum()),
+                "ms_total_cents": int(room_ms.sum()),
+                "grand_total_cents": int(room_upfront.sum() + room_ms.sum()),
+            }
+        return result
+
+    def price_rooms_dual_mode(catalog, room_list):
+        return price_dual_mode(catalog, [r['distance'] for r in room_list], [room_display_qty(r) for r in room_list])
+
+    # ==========================================
+    # PART 1J: CATALOG DIFF
+    # ==========================================
+
+    def package_fingerprint(tier):
+        return hashlib.sha1(pickle.dumps(tier, protocol=4)).digest()
+
+    def package_line_items(tier):
+        """
+        Flattens a Data#3 tier or Fit-Out package into {(category, description): price cents}.
+        Cisco items carry no price (None) - they're supplied by Data#3.
+        """
+        items = {}
+        if 'tier_name' in tier:
+            items[("Visual Display", tier.get('display_model', ""))] = to_cents(tier.get('display_price', 0))
+            items[("Mounting", tier.get('mount_model', ""))] = to_cents(tier.get('mount_price', 0))
+            items[("Cabling", tier.get('cables_misc', ""))] = to_cents(tier.get('cables_price', 0))
+            items[("Services", "Project Services")] = to_cents(tier.get('service_price', 0))
+            items[("Managed Service", "Annual")] = to_cents(tier.get('ms_annual', 0))
+            if tier.get('has_audio_upgrade_option'):
+                items[("Audio Upgrade", "Audio Upgrade")] = to_cents(tier.get('audio_upgrade_price', 10078.00))
+            for cisco in tier.get('cisco_items', []):
+                items[("Cisco", cisco)] = None
+            return items
+
+        for part in ('display', 'mount', 'vc', 'cables'):
+            if part in tier:
+                category, desc, price = tier[part][:3]
+                items[(category, desc)] = to_cents(price)
+        items[("Services", "Project Services")] = to_cents(tier.get('services', 0))
+        items[("Managed Service", "Annual")] = to_cents(tier.get('ms_price', 0))
+        for item in tier.get('items', []): # ExtraItems once the catalog is compiled
+            items[(item.category, item.name)] = to_cents(item.price)
+        if 'audio_upgrade' in tier:
+            for category, qty, desc, price in tier['audio_upgrade']['items']:
+                items[("Audio Upgrade: " + category, desc)] = to_cents(price)
+        return items
+
+    def percent_change(old_cents, new_cents):
+        if not old_cents:
+            return None
+        return (new_cents - old_cents) / old_cents * 100
+
+    def diff_line_items(old_tier, new_tier):
+        """
+        Item-level changes between two matched packages. Items match on (category, description);
+        a single unmatched item on each side of a category is reported as replaced.
+        """
+        old_items, new_items = package_line_items(old_tier), package_line_items(new_tier)
+        changes = []
+        for key in sorted(old_items.keys() & new_items.keys()):
+            if old_items[key] != new_items[key]:
+                changes.append({"kind": "repriced", "category": key[0], "old_desc": key[1], "new_desc": key[1],
+                                "old_cents": old_items[key], "new_cents": new_items[key]})
+
+        removed = {}
+        for key in old_items.keys() - new_items.keys():
+            removed.setdefault(key[0], []).append(key)
+        added = {}
+        for key in new_items.keys() - old_items.keys():
+            added.setdefault(key[0], []).append(key)
+
+        for category in sorted(removed.keys() | added.keys()):
+            gone, new = sorted(removed.get(category, [])), sorted(added.get(category, []))
+            if len(gone) == 1 and len(new) == 1:
+                changes.append({"kind": "replaced", "category": category, "old_desc": gone[0][1], "new_desc": new[0][1],
+                                "old_cents": old_items[gone[0]], "new_cents": new_items[new[0]]})
+                continue
+            for key in gone:
+                changes.append({"kind": "removed", "category": category, "old_desc": key[1], "new_desc": None,
+                                "old_cents": old_items[key], "new_cents": None})
+            for key in new:
+                changes.append({"kind": "added", "category": category, "old_desc": None, "new_desc": key[1],
+                                "old_cents": None, "new_cents": new_items[key]})
+        return changes
+
+    def diff_catalogs(old_catalog, new_catalog):
+        """
+        Compares two compiled catalogs, per mode. Packages match on key first, then on their
+        distance band (a band holding exactly one unmatched package on each side is a rename,
+        e.g. 'Small Room' -> '6P Meeting (55")'). Identical packages are skipped on a content hash,
+        so the work is linear in the size of the catalogs.
+        Returns {mode: {"added", "removed", "matched"}} where matched entries carry the Year 1
+        change and item-level changes of every package that differs.
+        """
+        report = {}
+        for project_mode in ("Data#3 (Cisco)", "Fit-Out (Full Scope)"):
+            old_band = get_tier_band(old_catalog['tier_index'], project_mode)
+            new_band = get_tier_band(new_catalog['tier_index'], project_mode)
+            old_pkgs = dict(zip(old_band['keys'], old_band['tiers']))
+            new_pkgs = dict(zip(new_band['keys'], new_band['tiers']))
+
+            pairs = [(key, key) for key in old_pkgs if key in new_pkgs]
+            old_by_band, new_by_band = {}, {}
+            for key in old_pkgs.keys() - new_pkgs.keys():
+                old_by_band.setdefault(float(old_pkgs[key]['max_distance']), []).append(key)
+            for key in new_pkgs.keys() - old_pkgs.keys():
+                new_by_band.setdefault(float(new_pkgs[key]['max_distance']), []).append(key)
+            for band, old_keys in old_by_band.items():
+                new_keys = new_by_band.get(band, [])
+                if len(old_keys) == 1 and len(new_keys) == 1:
+                    pairs.append((old_keys[0], new_keys[0]))
+                    del new_by_band[band]
+                    old_keys.clear()
+
+            matched = []
+            for old_key, new_key in pairs:
+                old_tier, new_tier = old_pkgs[old_key], new_pkgs[new_key]
+                if old_key == new_key and package_fingerprint(old_tier) == package_fingerprint(new_tier):
+                    continue
+                old_roll, new_roll = compute_rollup(old_tier, 1), compute_rollup(new_tier, 1)
+                matched.append({
+                    "old_key": old_key,
+                    "new_key": new_key,
+                    "old_y1_cents": old_roll['upfront_cents'] + old_roll['ms_annual_cents'],
+                    "new_y1_cents": new_roll['upfront_cents'] + new_roll['ms_annual_cents'],
+                    "max_distance": (old_tier['max_distance'], new_tier['max_distance']),
+                    "items": diff_line_items(old_tier, new_tier),
+                })
+
+            def y1(tier):
+                roll = compute_rollup(tier, 1)
+                return roll['upfront_cents'] + roll['ms_annual_cents']
+
+            added = {key for keys in new_by_band.values() for key in keys}
+            removed = {key for keys in old_by_band.values() for key in keys}
+            new_order = {key: i for i, key in enumerate(new_band['keys'])}
+            report[project_mode] = {
+                "added": [(key, y1(new_pkgs[key])) for key in new_band['keys'] if key in added],
+                "removed": [(key, y1(old_pkgs[key])) for key in old_band['keys'] if key in removed],
+                "matched": sorted(matched, key=lambda m: new_order[m['new_key']]),
+            }
+        return report
+
+    # ==========================================
+    # PART 1K: SKU / DESCRIPTION SEARCH INDEX
+    # ==========================================
+
+    # Part numbers: CS-BARPRO-K9, CS-MIC-CLGPRO=, CON-SNT-CSBARCK9, 98UM5K, QP37-69F ...
+    SKU_PATTERN = re.compile(r"[A-Z0-9][A-Z0-9\-=/+.]*[A-Z0-9=]|[A-Z0-9]")
+    WORD_PATTERN = re.compile(r"[A-Z0-9]+")
+
+    def index_tokens(text):
+        """
+        Search tokens of one line: whole part numbers plus the plain words inside them,
+        so 'CS-MIC-CLGPRO=' is found by the full SKU, by 'CLGPRO' or by 'MIC'.
+        """
+        text = text.upper()
+        return set(SKU_PATTERN.findall(text)) | set(WORD_PATTERN.findall(text))
+
+    def catalog_index_lines(pricelist_data, fitout_packages):
+        """
+        Every searchable quote line: (mode, package key, category, description).
+        """
+        lines = []
+        for tier in pricelist_data:
+            for category, desc in package_line_items(tier):
+                if desc and category not in ("Services", "Managed Service"):
+                    lines.append(("Data#3 (Cisco)", tier['tier_name'], category, desc))
+        for key, pkg in fitout_packages.items():
+            for category, desc in package_line_items(pkg):
+                if desc and category not in ("Services", "Managed Service"):
+                    lines.append(("Fit-Out (Full Scope)", key, category, desc))
+        return lines
+
+    def build_sku_index(pricelist_data, fitout_packages):
+        """
+        Inverted index over the catalog's quote lines, built once per catalog load.
+        - postings: token -> sorted line ids (exact lookups are one dict hit)
+        - tokens: sorted vocabulary, so a prefix is a bisect plus a short walk
+        - trigrams: 3-char gram -> vocabulary ids, so a substring only checks the
+          few tokens sharing all of its trigrams instead of the whole vocabulary
+        """
+        lines = catalog_index_lines(pricelist_data, fitout_packages)
+        postings = defaultdict(list)
+        text_tokens = {} # The same model / SKU text repeats across tiers - tokenise it once
+        for line_id, line in enumerate(lines):
+            tokens = text_tokens.get(line[3])
+            if tokens is None:
+                tokens = text_tokens[line[3]] = index_tokens(line[3])
+            for token in tokens:
+                postings[token].append(line_id)
+
+        tokens = sorted(postings)
+        trigrams = defaultdict(set)
+        for token_id, token in enumerate(tokens):
+            for i in range(len(token) - 2):
+                trigrams[token[i:i + 3]].add(token_id)
+
+        return {"lines": lines, "postings": dict(postings), "tokens": tokens, "trigrams": dict(trigrams)}
+
+    def match_index_tokens(sku_index, term, match="substring"):
+        """
+        Vocabulary tokens matching one search term ('exact', 'prefix' or 'substring').
+        """
+        term = term.upper()
+        tokens = sku_index['tokens']
+        if match == "exact":
+            return [term] if term in sku_index['postings'] else []
+
+        if match == "prefix" or len(term) < 3:
+            # Short substrings have no trigram to narrow on - treat them as prefixes
+            found = []
+            pos = bisect.bisect_left(tokens, term)
+            while pos < len(tokens) and tokens[pos].startswith(term):
+                found.append(tokens[pos])
+                pos += 1
+            return found
+
+        grams = sorted((sku_index['trigrams'].get(term[i:i + 3], set()) for i in range(len(term) - 2)), key=len)
+        candidates = grams[0].intersection(*grams[1:])
+        return [tokens[t] for t in candidates if term in tokens[t]]
+
+    def search_catalog(sku_index, query, match="substring"):
+        """
+        Line ids whose description matches every term of the query, e.g. 'CS-MIC-CLGPRO='
+        or 'LG 98UM5K'. Terms are split the same way the lines were indexed.
+        """
+        result = None
+        for term in query.upper().split():
+            line_ids = set()
+            for token in match_index_tokens(sku_index, term, match):
+                line_ids.update(sku_index['postings'][token])
+            result = line_ids if result is None else result & line_ids
+            if not result:
+                return []
+        return sorted(result or [])
+
     def get_fitout_text_blocks(r_type):
         """
         Returns a list of tuples: (Heading, BodyText)
@@ -268,12 +1629,11 @@ try:
                 ("Works in Association", "Standard power and data requirements apply."),
             ]
 
-    def generate_multi_room_proposal(client_name, room_list, project_mode, fitout_pkgs):
-        
-        # --- 0. SORT ROOM LIST (Smallest to Largest) ---
-        room_list.sort(key=lambda x: x['distance'])
+    # --- TEMPLATE CACHE ---
+    # Each template is unzipped and parsed once per process; proposals start from a deep copy.
+    TEMPLATE_CACHE = {} # path -> (file_stamp, parsed Document)
 
-        # --- 1. SELECT TEMPLATE ---
+    def proposal_template_path(project_mode):
         script_dir = os.path.dirname(os.path.abspath(__file__))
         
         if project_mode == "Data#3 (Cisco)":
@@ -281,10 +1641,565 @@ try:
         else:
             template_filename = "Template_Fitout.docx"
 
-        template_path = os.path.join(script_dir, template_filename)
+        return os.path.join(script_dir, template_filename)
+
+    def load_template(template_path):
+        """
+        Returns a private copy of the parsed template. The cached parse is refreshed
+        when the file's mtime or size changes, so edited templates are picked up.
+        """
+        stamp = file_stamp(template_path)
+        cached = TEMPLATE_CACHE.get(template_path)
+        if cached is None or cached[0] != stamp:
+            cached = (stamp, Document(template_path))
+            TEMPLATE_CACHE[template_path] = cached
+        return copy.deepcopy(cached[1])
+
+    # --- BULK TABLE BUILDER ---
+    # python-docx's add_row() / row.cells re-walk the whole table on every call, so large
+    # proposals slowed down as tables grew. Tables are instead described as row specs and
+    # emitted as one w:tbl string, parsed once. Cells are vertically centred by the
+    # "Alder Table" style rather than per cell.
+
+    def table_cell(text=None, bold=False, align=None, shade=None, span=1, style=None):
+        """
+        One cell of a row spec. text=None leaves the cell empty (no run);
+        align is a WD_ALIGN_PARAGRAPH value, shade a hex fill, style an ALDER_STYLES name.
+        """
+        return {"text": text, "bold": bold, "align": align, "shade": shade, "span": span, "style": style}
+
+    def table_row(height_cm, cells):
+        return {"height": height_cm, "cells": cells}
+
+    def run_text_xml(text):
+        # Same conversion as python-docx's run.text: tabs and line breaks become elements
+        parts = []
+        for piece in re.split(r"([\t\r\n])", text):
+            if piece == "\t":
+                parts.append("<w:tab/>")
+            elif piece in ("\r", "\n"):
+                parts.append("<w:br/>")
+            elif piece:
+                space = ' xml:space="preserve"' if len(piece.strip()) < len(piece) else ""
+                parts.append(f"<w:t{space}>{xml_escape(piece)}</w:t>")
+        return "".join(parts)
+
+    def table_cell_xml(cell, width):
+        tc_pr = f'<w:tcW w:type="dxa" w:w="{width}"/>'
+        if cell['span'] > 1:
+            tc_pr += f'<w:gridSpan w:val="{cell["span"]}"/>'
+        if cell['shade']:
+            tc_pr += f'<w:shd w:fill="{cell["shade"]}"/>'
+
+        p_pr = f'<w:pStyle w:val="{alder_style_id(cell["style"])}"/>' if cell['style'] else ""
+        if cell['align'] is not None:
+            p_pr += f'<w:jc w:val="{cell["align"].xml_value}"/>'
+        p_pr = f"<w:pPr>{p_pr}</w:pPr>" if p_pr else ""
+        run = ""
+        if cell['text'] is not None:
+            r_pr = "<w:rPr><w:b/></w:rPr>" if cell['bold'] else ""
+            run = f"<w:r>{r_pr}{run_text_xml(cell['text'])}</w:r>"
+        paragraph = f"<w:p>{p_pr}{run}</w:p>" if p_pr or run else "<w:p/>"
+        return f"<w:tc><w:tcPr>{tc_pr}</w:tcPr>{paragraph}</w:tc>"
+
+    def build_table_xml(rows, grid_widths, style_id=None, fixed_layout=False, cell_widths=None):
+        """
+        Complete w:tbl markup for a list of table_row specs.
+        grid_widths are the column widths in twips; cell_widths overrides the width written on
+        the cells (python-docx keeps the creation-time width on a table's first rows).
+        """
+        cell_widths = cell_widths or grid_widths
+        tbl_pr = f'<w:tblStyle w:val="{style_id}"/>' if style_id else ""
+        tbl_pr += '<w:tblW w:type="auto" w:w="0"/>'
+        if fixed_layout:
+            tbl_pr += '<w:tblLayout w:type="fixed"/>'
+        tbl_pr += ('<w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0" w:lastRow="0" '
+                   'w:noHBand="0" w:noVBand="1" w:val="04A0"/>')
+
+        xml = [f"<w:tbl {nsdecls('w')}><w:tblPr>{tbl_pr}</w:tblPr><w:tblGrid>"]
+        xml.extend(f'<w:gridCol w:w="{w}"/>' for w in grid_widths)
+        xml.append("</w:tblGrid>")
+
+        for row in rows:
+            xml.append(f'<w:tr><w:trPr><w:trHeight w:val="{Cm(row["height"]).twips}" '
+                       f'w:hRule="{WD_ROW_HEIGHT_RULE.AT_LEAST.xml_value}"/></w:trPr>')
+            col = 0
+            for cell in row['cells']:
+                xml.append(table_cell_xml(cell, sum(cell_widths[col:col + cell['span']])))
+                col += cell['span']
+            xml.append("</w:tr>")
+        xml.append("</w:tbl>")
+        return "".join(xml)
+
+    # --- NAMED STYLES ---
+    # Proposal formatting lives in styles installed once per document, so paragraphs and
+    # cells only carry a style id. Styles already defined in the template are left as-is.
+    ALDER_STYLES = {
+        "Alder Title":        {"size": 16, "bold": True, "before": 18, "after": 6, "keep_with_next": True},
+        "Alder Heading":      {"size": 14, "bold": True, "before": 18, "after": 6, "keep_with_next": True},
+        "Alder Subheading":   {"size": 12, "bold": True, "before": 18, "after": 6, "keep_with_next": True},
+        "Alder Body Heading": {"size": 11, "bold": True, "before": 12, "after": 2},
+        "Alder Body":         {"size": 11, "after": 6, "line_spacing": 1.15, "align": WD_ALIGN_PARAGRAPH.LEFT},
+        "Alder Room Header":  {"bold": True, "color": RGBColor(0xFF, 0xFF, 0xFF)},
+    }
+    HEADING_STYLES = {16: "Alder Title", 14: "Alder Heading", 12: "Alder Subheading"}
+    ALDER_TABLE_STYLE = "Alder Table" # Table Grid with vertically centred cells
+
+    def alder_style_id(name):
+        # Word and python-docx both derive the style id by dropping the spaces
+        return name.replace(" ", "")
+
+    def install_alder_styles(doc):
+        styles = doc.styles
+        for name, spec in ALDER_STYLES.items():
+            if name in styles: continue
+            style = styles.add_style(name, WD_STYLE_TYPE.PARAGRAPH)
+            style.base_style = styles['Normal']
+            style.font.name = 'Helvetica'
+            if "size" in spec: style.font.size = Pt(spec['size'])
+            if spec.get("bold"): style.font.bold = True
+            if "color" in spec: style.font.color.rgb = spec['color']
+            fmt = style.paragraph_format
+            if "before" in spec: fmt.space_before = Pt(spec['before'])
+            if "after" in spec: fmt.space_after = Pt(spec['after'])
+            if "line_spacing" in spec: fmt.line_spacing = spec['line_spacing']
+            if "align" in spec: fmt.alignment = spec['align']
+            if spec.get("keep_with_next"): fmt.keep_with_next = True
+
+        if ALDER_TABLE_STYLE not in styles:
+            style = styles.add_style(ALDER_TABLE_STYLE, WD_STYLE_TYPE.TABLE)
+            style.base_style = styles['Table Grid']
+            style.element.append(parse_xml(
+                f'<w:tcPr {nsdecls("w")}><w:vAlign w:val="{WD_ALIGN_VERTICAL.CENTER.xml_value}"/></w:tcPr>'))
+
+    # --- TEXT HELPERS (container is the Document or a detached section body) ---
+    def add_styled_paragraph(container, style_name, text=None):
+        # Sets the style by id so it also works on detached bodies with no styles part
+        p = container.add_paragraph(text)
+        p._p.get_or_add_pPr().style = alder_style_id(style_name)
+        return p
+
+    def add_manual_heading(container, text, size, color_rgb=None):
+        p = add_styled_paragraph(container, HEADING_STYLES[size])
+        run = p.add_run(text)
+        if color_rgb: run.font.color.rgb = color_rgb
+        return p
+
+    def add_body_text(container, text):
+        return add_styled_paragraph(container, "Alder Body", text)
+
+    def add_bold_heading_text(container, heading, text):
+        add_styled_paragraph(container, "Alder Body Heading", heading)
+        add_body_text(container, text)
+
+    # --- TEXT BLOCK FRAGMENTS ---
+    # The description paragraphs only depend on the screen size, so each size is rendered
+    # once per process and cloned into every room section that uses it.
+    TEXT_BLOCK_FRAGMENTS = {} # match_key -> list of w:p elements
+
+    def text_block_fragment(match_key):
+        fragment = TEXT_BLOCK_FRAGMENTS.get(match_key)
+        if fragment is None:
+            scratch = BlockItemContainer(parse_xml(f"<w:body {nsdecls('w')}/>"), None)
+            for heading, body in get_fitout_text_blocks(match_key):
+                add_bold_heading_text(scratch, heading, body)
+            fragment = TEXT_BLOCK_FRAGMENTS[match_key] = list(scratch._element)
+        return fragment
+
+    # --- ROOM DETAIL SECTIONS ---
+    # Each room's breakdown only depends on the room and the package data, so worker processes
+    # can render it into a detached w:body and return it as XML. The parent splices these
+    # into the proposal in room order.
+    # Spawned workers (Windows) pay ~0.3s of imports each against ~1ms per section, so the
+    # pool only pays off on very large proposals. The GUI always renders in-process.
+    PARALLEL_RENDER_MIN_ROOMS = 2000
+
+    def render_room_section(section, room, fitout_pkgs, table_style_id, block_width):
+        """
+        Renders one room's detail section (header bar, floor plan placeholder, text blocks, BOM)
+        into section, a BlockItemContainer over the proposal body or a detached one.
+        """
+        def auto_widths(cols):
+            return [Emu(block_width // cols).twips] * cols
+
+        def add_table(rows, grid_widths, fixed_layout=False, cell_widths=None):
+            section._element._insert_tbl(parse_xml(build_table_xml(rows, grid_widths, table_style_id, fixed_layout, cell_widths)))
+
+        name = room['name']
+        r_type = room['type']
+        dist = room['distance']
+
+        # --- HEADER ---
+        clean_type_name = room.get('pkg_key', r_type) if "Fit-Out" in r_type else r_type
+
+        # Create a small table for the header (Blue bar), full width
+        add_table([table_row(1.0, [
+            table_cell(f"ROOM: {name} - {clean_type_name} (Furthest Participant: {dist}m)",
+                       style="Alder Room Header", shade="1F4E79"),
+        ])], [Cm(18.0).twips], fixed_layout=True, cell_widths=auto_widths(1))
+
+        # --- IMAGE PLACEHOLDER ---
+        add_table([table_row(4.0, [
+            table_cell("[PASTE FLOOR PLAN IMAGE HERE]", align=WD_ALIGN_PARAGRAPH.CENTER),
+        ])], [Cm(18.0).twips], fixed_layout=True, cell_widths=auto_widths(1))
+            
+        # --- INSERT TEXT BLOCKS ---
+        # Even for Data#3, we use fitout text blocks as general descriptions based on size
+        match_key = ""
+        if "55" in clean_type_name: match_key = "55"
+        elif "65" in clean_type_name: match_key = "65"
+        elif "75" in clean_type_name: match_key = "75"
+        elif "86" in clean_type_name: match_key = "86"
+        elif "98" in clean_type_name: match_key = "98"
+            
+        for paragraph in text_block_fragment(match_key if match_key else "Default"):
+            section._element._insert_p(copy.deepcopy(paragraph))
+
+        # --- BOM TABLE (3 Cols, AutoFit to 18cm) ---
+        # Item 4.0cm | Qty 1.5cm | Description 12.5cm
+        bom_rows = []
+
+        # --- COL HEADERS ---
+        bom_rows.append(table_row(0.9, [
+            table_cell(text, bold=True, shade="D9E2F3") for text in ("Item", "Qty", "Description / Model")
+        ]))
+
+        def add_section_row(text, color_hex):
+            bom_rows.append(table_row(0.8, [table_cell(text, bold=True, shade=color_hex, span=3)]))
+
+        def add_row(cat, qty, desc, color_hex=None):
+            bom_rows.append(table_row(0.9, [
+                table_cell(cat, shade=color_hex),
+                table_cell(str(qty), align=WD_ALIGN_PARAGRAPH.CENTER, shade=color_hex),
+                table_cell(desc, shade=color_hex),
+            ]))
+
+        # =========================================================
+        # MODE A: FIT-OUT LOGIC
+        # =========================================================
+        if "Fit-Out" in r_type:
+            pkg = fitout_pkgs.get(r_type)
+            if not pkg and room.get('pkg_key'): pkg = fitout_pkgs.get(room['pkg_key'])
+
+            add_section_row("1. Hardware & Services Scope", "E7E6E6")
+
+            # 1. VC BAR
+            add_row(pkg['vc'][0], 1, pkg['vc'][1])
+                
+            # 2. DISPLAY
+            disp_qty = room_display_qty(room)
+            add_row(pkg['display'][0], disp_qty, pkg['display'][1])
+                
+            # 3. EXTRA ITEMS
+            for item in pkg['items']:
+                add_row(item[0], item[3], item[1])
+                
+            # 4. MOUNT & CABLES
+            add_row(pkg['mount'][0], 1, pkg['mount'][1])
+            add_row(pkg['cables'][0], 1, pkg['cables'][1])
+
+            # 6. SERVICES (FIXED)
+            add_row("Services", 1, "Total Services (Staging, Installation, PM, Engineering)")
+
+            # --- MANAGED SERVICES ---
+            add_section_row("2. Managed Services", "E7E6E6")
+            add_row("Support", 1, "Managed Service Agreement - Year 1 (Annual Billing)")
+
+            # --- 4. AUDIO UPGRADE TABLE (Attached to Room if 98") ---
+            if 'audio_upgrade' in pkg:
+                upg = pkg['audio_upgrade']
+                # Separate header for upgrade
+                add_section_row("3. Optional Upgrade: " + upg['name'], "FCE4D6")
+                    
+                for item_code, qty, desc, price in upg['items']:
+                    add_row(item_code, qty, desc)
+
+        # =========================================================
+        # MODE B: DATA#3 (CISCO) LOGIC
+        # =========================================================
+        else:
+            data = room['config']
+                
+            final_cisco_list = []
+            # Simple list processing for Data#3 items
+            for item in data['cisco_items']:
+                if not item: continue
+                final_cisco_list.append(item)
+
+            if final_cisco_list:
+                add_section_row("1. Data#3 Supply Scope (Cisco Hardware)", "E7E6E6")
+
+                for item in final_cisco_list:
+                    add_row("Video Conf", 1, item, "FFF2CC")
+
+            add_section_row("2. Alder Technology Supply Scope", "E7E6E6")
+
+            add_row("Visual Display", room_display_qty(room), data['display_model'])
+            add_row("Mounting", 1, data['mount_model'])
+            add_row("Cabling", 1, data['cables_misc'])
+            add_row("Services", 1, "Professional Services: Installation, Staging & PM")
+
+            add_section_row("3. Managed Services", "E7E6E6")
+            add_row("Support", 1, "Managed Service Agreement - Year 1 (Annual Billing)")
+
+        add_table(bom_rows, [Cm(4.0).twips, Cm(1.5).twips, Cm(12.5).twips], fixed_layout=True)
+
+        section.add_paragraph("")
+
+    def build_room_section_xml(job):
+        """
+        Process-pool worker: renders one room's section into a detached w:body and
+        returns it as an XML string.
+        """
+        room, fitout_pkgs, table_style_id, block_width = job
+        section = BlockItemContainer(parse_xml(f"<w:body {nsdecls('w')}/>"), None)
+        render_room_section(section, room, fitout_pkgs, table_style_id, block_width)
+        return etree.tostring(section._element, encoding="unicode")
+
+    def section_worker_count(room_count, max_workers=None):
+        # Processes to render room sections with. max_workers=None uses every core once there are
+        # PARALLEL_RENDER_MIN_ROOMS rooms; an explicit count is honoured (1 keeps it in-process)
+        if max_workers is not None:
+            return max(1, min(max_workers, room_count))
+        return (os.cpu_count() or 1) if room_count >= PARALLEL_RENDER_MIN_ROOMS else 1
+
+    def render_section_jobs(jobs, max_workers=None):
+        # Section XML for each build_room_section_xml job, in order
+        workers = section_worker_count(len(jobs), max_workers)
+        if workers < 2:
+            for job in jobs:
+                yield build_room_section_xml(job)
+            return
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            yield from pool.map(build_room_section_xml, jobs, chunksize=max(1, len(jobs) // (workers * 4)))
+
+    # --- SECTION RENDER CACHE ---
+    # Rendered sections are kept per process by a hash of what they are built from, so
+    # regenerating after editing one room only renders that room. Pricing for the summary
+    # already comes from the cached package rollups. The cache never grows past
+    # SECTION_CACHE_MAX_BYTES, which also bounds what a streamed proposal keeps in memory.
+    SECTION_CACHE = {} # room_section_key -> section XML, least recently used first
+    SECTION_CACHE_BYTES = 0 # Memory held by the XML strings in SECTION_CACHE
+    SECTION_CACHE_MAX_BYTES = 32 * 1024 * 1024 # Least recently used sections are dropped beyond this
+    SECTION_CACHE_STATS = {'reused': 0, 'rendered': 0} # Running counts, read by the benchmark
+
+    def room_section_key(room, fitout_pkgs, table_style_id, block_width):
+        """
+        Content hash of everything one room's section is rendered from.
+        """
+        _, package = resolve_room_package(room, fitout_pkgs)
+        payload = json.dumps([room, package, table_style_id, block_width], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def store_room_section(key, section_xml, keep):
+        """
+        Adds a rendered section to SECTION_CACHE within SECTION_CACHE_MAX_BYTES, dropping least
+        recently used sections that are not in keep. False when it does not fit.
+        """
+        global SECTION_CACHE_BYTES
+        size = sys.getsizeof(section_xml)
+        if SECTION_CACHE_BYTES + size > SECTION_CACHE_MAX_BYTES:
+            for old_key in [k for k in SECTION_CACHE if k not in keep]:
+                SECTION_CACHE_BYTES -= sys.getsizeof(SECTION_CACHE.pop(old_key))
+                if SECTION_CACHE_BYTES + size <= SECTION_CACHE_MAX_BYTES:
+                    break
+            else:
+                return False
+        SECTION_CACHE[key] = section_xml
+        SECTION_CACHE_BYTES += size
+        return True
+
+    def iter_room_section_xml(room_list, fitout_pkgs, table_style_id, block_width, max_workers=None, use_cache=True):
+        """
+        Yields each room's section as a w:body XML string, in room order. With use_cache, only
+        rooms not in SECTION_CACHE are rendered (across workers if there are enough of them),
+        and new sections are kept while they fit in the cache.
+        """
+        jobs = [(room, fitout_pkgs, table_style_id, block_width) for room in room_list]
+        if not use_cache:
+            yield from render_section_jobs(jobs, max_workers)
+            return
+
+        keys = [room_section_key(*job) for job in jobs]
+        misses = [key not in SECTION_CACHE for key in keys]
+        SECTION_CACHE_STATS['rendered'] += sum(misses)
+        SECTION_CACHE_STATS['reused'] += len(keys) - sum(misses)
+        rendered = render_section_jobs([job for job, miss in zip(jobs, misses) if miss], max_workers)
+
+        keep = set(keys) # This run never evicts its own sections, so every hit above is still there
+        cache_full = False
+        for key, miss in zip(keys, misses):
+            if miss:
+                section_xml = next(rendered)
+                if not cache_full and key not in SECTION_CACHE: # Repeated rooms are stored once
+                    cache_full = not store_room_section(key, section_xml, keep)
+            else:
+                section_xml = SECTION_CACHE.pop(key)
+                SECTION_CACHE[key] = section_xml # Reinserted as most recently used
+            yield section_xml
+
+    def render_room_sections(doc, room_list, fitout_pkgs, table_style_id, block_width, max_workers=None, use_cache=True):
+        """
+        Appends every room's detail section to the document in room order, reusing cached
+        sections and rendering the rest across worker processes for large proposals.
+        """
+        body = doc.element.body
+        anchor = body.sectPr # Looked up once - the property scans the whole body
+
+        def splice(blocks):
+            for block in list(blocks):
+                if anchor is not None:
+                    anchor.addprevious(block)
+                else:
+                    body.append(block)
+
+        if not use_cache and section_worker_count(len(room_list), max_workers) < 2:
+            # Render into a scratch body - adding straight to a large document rescans it per block
+            for room in room_list:
+                section = BlockItemContainer(parse_xml(f"<w:body {nsdecls('w')}/>"), doc)
+                render_room_section(section, room, fitout_pkgs, table_style_id, block_width)
+                splice(section._element)
+            return
+
+        for section_xml in iter_room_section_xml(room_list, fitout_pkgs, table_style_id, block_width, max_workers, use_cache):
+            splice(parse_xml(section_xml))
+
+    # --- STREAMING OUTPUT ---
+    # Very large proposals skip building the room sections into the document. The rest of the
+    # proposal is saved with a marker paragraph where they belong, then word/document.xml is
+    # rewritten with each section streamed in as it is rendered. Every other part is copied as-is.
+    STREAM_MIN_ROOMS = 200
+    ROOM_SECTIONS_MARKER = "[[ALDER ROOM SECTIONS]]"
+
+    def body_xml_blocks(body_xml):
+        # Inner markup of a serialised w:body - the blocks without the wrapper element
+        return body_xml[body_xml.index(">") + 1:body_xml.rindex("</w:body>")]
+
+    def save_streamed_proposal(doc, full_path, sections):
+        """
+        Saves doc to full_path, replacing the ROOM_SECTIONS_MARKER paragraph with the
+        section XML strings from the sections iterable. Only one section is held at a time.
+        """
+        marker = f"<w:p><w:r><w:t>{ROOM_SECTIONS_MARKER}</w:t></w:r></w:p>".encode("utf-8")
+        skeleton = io.BytesIO()
+        doc.save(skeleton)
+
+        with zipfile.ZipFile(skeleton) as zin, zipfile.ZipFile(full_path, "w", zipfile.ZIP_DEFLATED) as zout:
+            for info in zin.infolist():
+                part_info = zipfile.ZipInfo(info.filename, info.date_time)
+                part_info.compress_type = info.compress_type
+                with zin.open(info) as src, zout.open(part_info, "w") as dst:
+                    if info.filename != "word/document.xml":
+                        shutil.copyfileobj(src, dst)
+                        continue
+                    head, tail = src.read().split(marker, 1)
+                    dst.write(head)
+                    for section_xml in sections:
+                        dst.write(body_xml_blocks(section_xml).encode("utf-8"))
+                    dst.write(tail)
+
+    # --- PROPOSAL OUTPUT CACHE ---
+    # A proposal only depends on its inputs, the catalog, the template and this script. Saved
+    # proposals are kept in a per-user local cache folder by a hash of all of those; a repeat
+    # request copies the stored file to the new name instead of rendering again. The stored copy
+    # stays pristine when staff edit the issued one, and never lands in the (often synced) quotes folder.
+    OUTPUT_CACHE_MAX_BYTES = 256 * 1024 * 1024 # Least recently used proposals are dropped beyond this
+    FILE_HASHES = {} # path -> (file_stamp, sha256), so unchanged files are hashed once per process
+
+    def stamped_file_sha256(path):
+        stamp = file_stamp(path)
+        cached = FILE_HASHES.get(path)
+        if cached is None or cached[0] != stamp:
+            cached = (stamp, file_sha256(path) if stamp else None)
+            FILE_HASHES[path] = cached
+        return cached[1]
+
+    def proposal_cache_key(client_name, room_list, project_mode, fitout_pkgs, catalog_version=None, compare_catalog=None):
+        """
+        Canonical hash of everything a proposal's content depends on. Rendering options
+        (workers, streaming) are left out - they produce identical documents.
+        """
+        payload = json.dumps({
+            "client": client_name,
+            "mode": project_mode,
+            "rooms": room_list, # Already sorted by generate_multi_room_proposal
+            "catalog": catalog_version or package_fingerprint(fitout_pkgs).hex(),
+            "compare": compare_catalog['version'] if compare_catalog else None,
+            "template": stamped_file_sha256(proposal_template_path(project_mode)),
+            "generator": stamped_file_sha256(os.path.abspath(__file__)),
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def output_cache_dir():
+        # Local, non-roaming app data on Windows; the XDG cache folder elsewhere
+        if os.name == "nt":
+            base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~/AppData/Local")
+            return os.path.join(base, "Alder_Quotes", "cache")
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+        return os.path.join(base, "alder_quoter", "proposals")
+
+    def fetch_cached_proposal(cache_path, full_path):
+        # Copies a cached proposal to full_path; False when there is none
+        try:
+            shutil.copyfile(cache_path, full_path)
+            os.utime(cache_path) # Mark as recently used
+            return True
+        except OSError:
+            return False
+
+    def store_cached_proposal(full_path, cache_path):
+        # The cache is best-effort: a failure here never fails the proposal itself
+        cache_dir = os.path.dirname(cache_path)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            temp_path = f"{cache_path}.{os.getpid()}.tmp"
+            shutil.copyfile(full_path, temp_path)
+            os.replace(temp_path, cache_path)
+
+            entries = sorted((e for e in os.scandir(cache_dir) if e.name.endswith(".docx")),
+                             key=lambda e: e.stat().st_mtime, reverse=True)
+            total_bytes = 0
+            for entry in entries:
+                total_bytes += entry.stat().st_size
+                if total_bytes > OUTPUT_CACHE_MAX_BYTES:
+                    os.remove(entry.path)
+        except OSError:
+            pass
+
+    def safe_client_name(client_name):
+        # The client part of a proposal's file name - letters, digits and spaces only
+        return "".join([c for c in client_name if c.isalpha() or c.isdigit() or c==' ']).rstrip()
+
+    def generate_multi_room_proposal(client_name, room_list, project_mode, fitout_pkgs, catalog_version=None, project_totals=None,
+                                     compare_catalog=None, max_workers=None, stream=None, save_folder=None, use_cache=True):
+        
+        # --- 0. SORT ROOM LIST (Smallest to Largest) ---
+        room_list.sort(key=lambda x: x['distance'])
+
+        if save_folder is None:
+            desktop = os.path.expanduser("~/Desktop")
+            save_folder = os.path.join(desktop, "Alder_Quotes")
+        if not os.path.exists(save_folder):
+            os.makedirs(save_folder)
+
+        timestamp = datetime.now().strftime("%H-%M-%S")
+        filename = f"Alder_Quote_{safe_client_name(client_name)}_{project_mode[:4]}_{timestamp}.docx"
+        full_path = os.path.join(save_folder, filename)
+
+        # --- 0b. OUTPUT CACHE (unchanged inputs reuse the previous document) ---
+        cache_path = None
+        if use_cache:
+            cache_key = proposal_cache_key(client_name, room_list, project_mode, fitout_pkgs, catalog_version, compare_catalog)
+            cache_path = os.path.join(output_cache_dir(), cache_key + ".docx")
+            if fetch_cached_proposal(cache_path, full_path):
+                return full_path
+
+        # --- 1. SELECT TEMPLATE ---
+        template_path = proposal_template_path(project_mode)
         
         if os.path.exists(template_path):
-            doc = Document(template_path)
+            doc = load_template(template_path)
             doc.add_page_break() 
         else:
             doc = Document()
@@ -303,57 +2218,26 @@ try:
             section.right_margin = Cm(1.5)
         except: pass
 
+        install_alder_styles(doc)
+
         # --- HELPERS ---
-        def shade_cell(cell, color_hex):
-            shading_elm = parse_xml(r'<w:shd {} w:fill="{}"/>'.format(nsdecls('w'), color_hex))
-            cell._tc.get_or_add_tcPr().append(shading_elm)
-
-        def add_manual_heading(text, size, color_rgb=None):
-            p = doc.add_paragraph()
-            p.paragraph_format.space_before = Pt(18)
-            p.paragraph_format.space_after = Pt(6)
-            p.paragraph_format.keep_with_next = True
-            run = p.add_run(text)
-            run.bold = True
-            run.font.name = 'Helvetica'
-            run.font.size = Pt(size)
-            if color_rgb: run.font.color.rgb = color_rgb
-            return p
-        
-        def add_body_text(text):
-            p_body = doc.add_paragraph(text)
-            p_body.paragraph_format.space_after = Pt(6) 
-            p_body.paragraph_format.line_spacing = 1.15  
-            p_body.alignment = WD_ALIGN_PARAGRAPH.LEFT
-            for run in p_body.runs:
-                run.font.name = 'Helvetica'
-                run.font.size = Pt(11) # Size 11
-            return p_body
-
-        def add_bold_heading_text(heading, text):
-            # Heading Paragraph
-            p_head = doc.add_paragraph()
-            p_head.paragraph_format.space_before = Pt(12)
-            p_head.paragraph_format.space_after = Pt(2)
-            run_h = p_head.add_run(heading)
-            run_h.bold = True
-            run_h.font.name = 'Helvetica'
-            run_h.font.size = Pt(11)
-
-            # Body Paragraph
-            add_body_text(text)
-            
-        def format_row(row, height_cm):
-            row.height = Cm(height_cm)
-            row.height_rule = WD_ROW_HEIGHT_RULE.AT_LEAST
-            for cell in row.cells:
-                cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
+        block_width = doc._block_width # Page width between margins, as python-docx sizes new tables
+        table_style_id = doc.part.get_style_id(ALDER_TABLE_STYLE, WD_STYLE_TYPE.TABLE)
+
+        def auto_widths(cols):
+            # Even split of the page width - python-docx's default column sizing
+            return [Emu(block_width // cols).twips] * cols
+
+        def add_table(rows, grid_widths, fixed_layout=False, cell_widths=None):
+            tbl = parse_xml(build_table_xml(rows, grid_widths, table_style_id, fixed_layout, cell_widths))
+            doc.element.body._insert_tbl(tbl)
+            return tbl
 
         # ---------------------------------------------------------
         # PAGE 1: EXECUTIVE SUMMARY
         # ---------------------------------------------------------
         
-        add_manual_heading('Partnership Overview', 14)
+        add_manual_heading(doc, 'Partnership Overview', 14)
         
         if project_mode == "Data#3 (Cisco)":
             overview_text = (
@@ -370,160 +2254,107 @@ try:
                 "including all visual displays, conferencing bars, and installation services."
             )
             
-        add_body_text(overview_text)
+        add_body_text(doc, overview_text)
 
-        add_manual_heading('1. Master Room Summary & Pricing', 14)
-        
-        table = doc.add_table(rows=1, cols=5)
-        table.style = 'Table Grid'
-        
-        hdr_row = table.rows[0]
-        format_row(hdr_row, 1.0)
-        hdr = hdr_row.cells
-        
-        hdr[0].text = "Room Name"
-        hdr[1].text = "Classification"
-        hdr[2].text = "Supply & Services" 
-        hdr[3].text = "Managed Service P/A\n(5 Years)"
-        hdr[4].text = "Total Year 1 (Ex GST)"
-
-        for cell in hdr:
-            shade_cell(cell, "D9E2F3")
-            cell.paragraphs[0].runs[0].bold = True
-            cell.paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-
-        grand_total_project = 0
-        
-        # COUNTERS FOR CONSOLIDATED OPTIONS
-        qty_booking_panels = 0
-        qty_audio_upgrades = 0
+        add_manual_heading(doc, '1. Master Room Summary & Pricing', 14)
 
         # --- CALCULATE TOTALS ---
-        for room in room_list:
-            name = room['name']
-            r_type = room['type'] 
-            dist = room['distance'] 
-            
-            # Every room gets a booking panel option added to counter
-            qty_booking_panels += 1
+        # Reuse the running totals kept by the GUI when they match this catalog,
+        # otherwise price the whole room list in one vectorised pass
+        pricing = None
+        if project_totals and project_totals['catalog_version'] == catalog_version:
+            pricing = pricing_from_totals(room_list, project_totals)
+        if pricing is None:
+            pricing = price_project(room_list, fitout_pkgs, catalog_version)
+        grand_total_project = pricing['grand_total_cents']
 
-            # --- FIT OUT CALCULATION ---
-            if "Fit-Out" in r_type:
-                pkg = fitout_pkgs.get(r_type)
-                if not pkg and room.get('pkg_key'):
-                     pkg = fitout_pkgs.get(room['pkg_key'])
+        # COUNTERS FOR CONSOLIDATED OPTIONS
+        qty_booking_panels = pricing['qty_booking_panels']
+        qty_audio_upgrades = pricing['qty_audio_upgrades']
 
-                if not pkg: 
-                    continue 
+        upfront_list = pricing['upfront_cents'].tolist()
+        ms_list = pricing['ms_annual_cents'].tolist()
+        total_list = pricing['total_y1_cents'].tolist()
 
-                ms_annual = pkg['ms_price']
-                
-                # Handle Dual Screen Cost
-                qty_display = 2 if "Dual" in r_type else 1
-                cost_display = pkg['display'][2] * qty_display
-                
-                cost_mount = pkg['mount'][2]
-                cost_vc = pkg['vc'][2]
-                cost_cables = pkg['cables'][2]
-                cost_services = pkg['services']
-                
-                cost_extras = sum([item[2] * item[3] for item in pkg['items']])
+        summary_rows = [table_row(1.0, [
+            table_cell(text, bold=True, align=WD_ALIGN_PARAGRAPH.CENTER, shade="D9E2F3")
+            for text in ("Room Name", "Classification", "Supply & Services", "Managed Service P/A\n(5 Years)", "Total Year 1 (Ex GST)")
+        ])]
 
-                upfront_cost = cost_display + cost_mount + cost_vc + cost_cables + cost_services + cost_extras
-                
+        for idx, room in enumerate(room_list):
+            if not pricing['valid'][idx]:
+                continue
+
+            name = room['name']
+            r_type = room['type']
+            dist = room['distance']
+
+            if "Fit-Out" in r_type:
                 display_name = room.get('pkg_key', r_type)
                 display_label = f"{display_name} ({dist}m)"
-                
-                if 'audio_upgrade' in pkg:
-                    qty_audio_upgrades += 1
-                
-            # --- DATA#3 CALCULATION ---
             else:
-                data = room['config']
-                upfront_cost = data['display_price'] + data['mount_price'] + data['cables_price'] + data['service_price']
-                ms_annual = data['ms_annual']
-                display_label = f"{data['tier_name']} ({dist}m)"
-                
-                if data.get('has_audio_upgrade_option'):
-                    qty_audio_upgrades += 1
+                display_label = f"{room['config']['tier_name']} ({dist}m)"
 
-            room_total_y1 = upfront_cost + ms_annual
-            grand_total_project += room_total_y1
+            upfront_cost = upfront_list[idx]
+            ms_annual = ms_list[idx]
+            room_total_y1 = total_list[idx]
 
-            row_obj = table.add_row()
-            format_row(row_obj, 0.9)
-            row = row_obj.cells
-            
-            row[0].text = name
-            row[1].text = display_label
-            row[2].text = f"${upfront_cost:,.0f}"
-            row[3].text = f"${ms_annual:,.0f}"
-            row[4].text = f"${room_total_y1:,.2f}"
-            
-            for i in range(2, 5):
-                row[i].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.RIGHT
+            summary_rows.append(table_row(0.9, [
+                table_cell(name),
+                table_cell(display_label),
+                table_cell(f"${format_cents(upfront_cost, 0)}", align=WD_ALIGN_PARAGRAPH.RIGHT),
+                table_cell(f"${format_cents(ms_annual, 0)}", align=WD_ALIGN_PARAGRAPH.RIGHT),
+                table_cell(f"${format_cents(room_total_y1)}", align=WD_ALIGN_PARAGRAPH.RIGHT),
+            ]))
+
+        add_table(summary_rows, auto_widths(5))
 
         doc.add_paragraph("\n")
         p_total = doc.add_paragraph()
         p_total.alignment = WD_ALIGN_PARAGRAPH.RIGHT
-        runner = p_total.add_run(f"TOTAL YEAR 1 PROJECT VALUE (EX GST): ${grand_total_project:,.2f}")
+        runner = p_total.add_run(f"TOTAL YEAR 1 PROJECT VALUE (EX GST): ${format_cents(grand_total_project)}")
         runner.bold = True
         runner.font.size = Pt(16)
         runner.font.color.rgb = RGBColor(0, 102, 204)
 
         # --- CONSOLIDATED OPTIONAL UPGRADES TABLE ---
         if qty_booking_panels > 0 or qty_audio_upgrades > 0:
-            add_manual_heading('Optional Upgrades (Not included in Total above)', 12, RGBColor(255, 0, 0))
+            add_manual_heading(doc, 'Optional Upgrades (Not included in Total above)', 12, RGBColor(255, 0, 0))
             
-            opt_table = doc.add_table(rows=1, cols=5)
-            opt_table.style = 'Table Grid'
-            # AutoFit enabled
-
-            h_row = opt_table.rows[0]
-            format_row(h_row, 0.9)
-            h_cells = h_row.cells
-            h_cells[0].text = "Upgrade Item"
-            h_cells[1].text = "Qty"
-            h_cells[2].text = "Description"
-            h_cells[3].text = "Unit Cost"
-            h_cells[4].text = "Total Cost"
-            for c in h_cells:
-                shade_cell(c, "E7E6E6")
-                c.paragraphs[0].runs[0].bold = True
+            opt_rows = [table_row(0.9, [
+                table_cell(text, bold=True, shade="E7E6E6")
+                for text in ("Upgrade Item", "Qty", "Description", "Unit Cost", "Total Cost")
+            ])]
 
             # ROW 1: BOOKING PANELS
             if qty_booking_panels > 0:
                 if project_mode == "Data#3 (Cisco)":
-                    price_unit = 450.00
+                    price_unit = to_cents(450.00)
                     desc_text = "Cisco Room Navigator Wall Mount (Hardware supplied by Data#3) + Install Services"
                 else:
-                    price_unit = 2200.00
+                    price_unit = to_cents(2200.00)
                     desc_text = "Crestron TS-1070 with Lightbar kit and Multi Surface Mount"
 
                 total_panel = price_unit * qty_booking_panels
-                
-                r_bp = opt_table.add_row()
-                format_row(r_bp, 0.8)
-                cells_bp = r_bp.cells
-                cells_bp[0].text = "Room Booking Panel"
-                cells_bp[1].text = str(qty_booking_panels)
-                cells_bp[1].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-                cells_bp[2].text = desc_text
-                cells_bp[3].text = f"${price_unit:,.2f}"
-                cells_bp[4].text = f"${total_panel:,.2f}"
-                cells_bp[3].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.RIGHT
-                cells_bp[4].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.RIGHT
+
+                opt_rows.append(table_row(0.8, [
+                    table_cell("Room Booking Panel"),
+                    table_cell(str(qty_booking_panels), align=WD_ALIGN_PARAGRAPH.CENTER),
+                    table_cell(desc_text),
+                    table_cell(f"${format_cents(price_unit)}", align=WD_ALIGN_PARAGRAPH.RIGHT),
+                    table_cell(f"${format_cents(total_panel)}", align=WD_ALIGN_PARAGRAPH.RIGHT),
+                ]))
 
             # ROW 2: AUDIO UPGRADES (IF ANY 98" ROOMS)
             if qty_audio_upgrades > 0:
                 if project_mode == "Data#3 (Cisco)":
-                    unit_price = 10078.00
+                    unit_price = to_cents(10078.00)
                     name_text = "Audio Upgrade (Shure Ceiling Speakers + Services)"
                 else:
                     pkg_98 = fitout_pkgs.get("Fit-Out 98")
                     if pkg_98 and 'audio_upgrade' in pkg_98:
                         upg_data = pkg_98['audio_upgrade']
-                        unit_price = upg_data['total_price']
+                        unit_price = to_cents(upg_data['total_price'])
                         name_text = upg_data['name']
                     else:
                         unit_price = 0
@@ -531,264 +2362,116 @@ try:
 
                 total_upg = unit_price * qty_audio_upgrades
 
-                r_au = opt_table.add_row()
-                format_row(r_au, 0.8)
-                cells_au = r_au.cells
-                cells_au[0].text = "Premium Audio"
-                cells_au[1].text = str(qty_audio_upgrades)
-                cells_au[1].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-                cells_au[2].text = name_text
-                cells_au[3].text = f"${unit_price:,.2f}"
-                cells_au[4].text = f"${total_upg:,.2f}"
-                cells_au[3].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.RIGHT
-                cells_au[4].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.RIGHT
+                opt_rows.append(table_row(0.8, [
+                    table_cell("Premium Audio"),
+                    table_cell(str(qty_audio_upgrades), align=WD_ALIGN_PARAGRAPH.CENTER),
+                    table_cell(name_text),
+                    table_cell(f"${format_cents(unit_price)}", align=WD_ALIGN_PARAGRAPH.RIGHT),
+                    table_cell(f"${format_cents(total_upg)}", align=WD_ALIGN_PARAGRAPH.RIGHT),
+                ]))
+
+            add_table(opt_rows, auto_widths(5)) # AutoFit enabled
+
+        # --- SCOPE COMPARISON TABLE (DATA#3 VS FIT-OUT) ---
+        if compare_catalog is not None:
+            dual = price_rooms_dual_mode(compare_catalog, room_list)
+            d3 = dual["Data#3 (Cisco)"]
+            fo = dual["Fit-Out (Full Scope)"]
+
+            add_manual_heading(doc, 'Scope Comparison: Data#3 (Cisco) vs Fit-Out (Full Scope)', 12)
+
+            cmp_rows = [table_row(0.9, [
+                table_cell(text, bold=True, align=WD_ALIGN_PARAGRAPH.CENTER, shade="D9E2F3")
+                for text in ("Room Name", "Data#3 Tier", "Data#3 Year 1", "Fit-Out Package", "Fit-Out Year 1")
+            ])]
+
+            d3_y1 = d3['total_y1_cents'].tolist()
+            fo_y1 = fo['total_y1_cents'].tolist()
+            for idx, room in enumerate(room_list):
+                cmp_rows.append(table_row(0.8, [
+                    table_cell(room['name']),
+                    table_cell(d3['tier_keys'][idx] or "Not covered"),
+                    table_cell(f"${format_cents(d3_y1[idx])}" if d3['valid'][idx] else "-", align=WD_ALIGN_PARAGRAPH.RIGHT),
+                    table_cell(fo['tier_keys'][idx] or "Not covered"),
+                    table_cell(f"${format_cents(fo_y1[idx])}" if fo['valid'][idx] else "-", align=WD_ALIGN_PARAGRAPH.RIGHT),
+                ]))
+
+            for label, key in (("Supply & Services", 'upfront_total_cents'),
+                               ("Managed Service P/A", 'ms_total_cents'),
+                               ("Total Year 1 (Ex GST)", 'grand_total_cents')):
+                cmp_rows.append(table_row(0.8, [
+                    table_cell(label, bold=True, shade="E7E6E6"),
+                    table_cell(shade="E7E6E6"),
+                    table_cell(f"${format_cents(d3[key])}", bold=True, align=WD_ALIGN_PARAGRAPH.RIGHT, shade="E7E6E6"),
+                    table_cell(shade="E7E6E6"),
+                    table_cell(f"${format_cents(fo[key])}", bold=True, align=WD_ALIGN_PARAGRAPH.RIGHT, shade="E7E6E6"),
+                ]))
+
+            add_table(cmp_rows, auto_widths(5))
+
+            doc.add_paragraph("Data#3 pricing excludes Cisco hardware, which is supplied and priced by Data#3.")
         
         # ---------------------------------------------------------
         # PAGE 2+: DETAILED ROOM BREAKDOWNS
         # ---------------------------------------------------------
         
         doc.add_page_break()
-        add_manual_heading('2. Detailed Room Specifications', 16)
-
-        for room in room_list:
-            name = room['name']
-            r_type = room['type']
-            dist = room['distance']
-
-            # --- HEADER ---
-            clean_type_name = room.get('pkg_key', r_type) if "Fit-Out" in r_type else r_type
-
-            # Create a small table for the header (Blue bar)
-            table_hdr = doc.add_table(rows=1, cols=1)
-            table_hdr.style = 'Table Grid'
-            table_hdr.autofit = False
-            table_hdr.columns[0].width = Cm(18.0) # Full width
-            
-            row_hdr = table_hdr.rows[0]
-            format_row(row_hdr, 1.0)
-            cell_hdr = row_hdr.cells[0]
-            cell_hdr.text = f"ROOM: {name} - {clean_type_name} (Furthest Participant: {dist}m)"
-            shade_cell(cell_hdr, "1F4E79")
-            cell_hdr.paragraphs[0].runs[0].font.color.rgb = RGBColor(255, 255, 255)
-            cell_hdr.paragraphs[0].runs[0].bold = True
-
-            # --- IMAGE PLACEHOLDER ---
-            table_img = doc.add_table(rows=1, cols=1)
-            table_img.style = 'Table Grid'
-            table_img.autofit = False
-            table_img.columns[0].width = Cm(18.0)
-            
-            row_img = table_img.rows[0]
-            format_row(row_img, 4.0)
-            cell_img = row_img.cells[0]
-            cell_img.text = "[PASTE FLOOR PLAN IMAGE HERE]"
-            cell_img.paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-            
-            # --- INSERT TEXT BLOCKS ---
-            # Even for Data#3, we use fitout text blocks as general descriptions based on size
-            match_key = ""
-            if "55" in clean_type_name: match_key = "55"
-            elif "65" in clean_type_name: match_key = "65"
-            elif "75" in clean_type_name: match_key = "75"
-            elif "86" in clean_type_name: match_key = "86"
-            elif "98" in clean_type_name: match_key = "98"
-            
-            text_blocks = get_fitout_text_blocks(match_key if match_key else "Default")
-            for heading, body in text_blocks:
-                add_bold_heading_text(heading, body)
-
-            # --- BOM TABLE (3 Cols, AutoFit to 18cm) ---
-            table_room = doc.add_table(rows=0, cols=3)
-            table_room.style = 'Table Grid'
-            table_room.autofit = False 
-            table_room.columns[0].width = Cm(4.0) # Item
-            table_room.columns[1].width = Cm(1.5) # Qty
-            table_room.columns[2].width = Cm(12.5) # Description
-
-            # --- COL HEADERS ---
-            row_cols_obj = table_room.add_row()
-            format_row(row_cols_obj, 0.9)
-            row_cols = row_cols_obj.cells
-            row_cols[0].text = "Item"
-            row_cols[1].text = "Qty"
-            row_cols[2].text = "Description / Model"
-            
-            for c in row_cols:
-                shade_cell(c, "D9E2F3")
-                c.paragraphs[0].runs[0].bold = True
-
-            # =========================================================
-            # MODE A: FIT-OUT LOGIC
-            # =========================================================
-            if "Fit-Out" in r_type:
-                pkg = fitout_pkgs.get(r_type)
-                if not pkg and room.get('pkg_key'): pkg = fitout_pkgs.get(room['pkg_key'])
-
-                row_sec1_obj = table_room.add_row()
-                format_row(row_sec1_obj, 0.8)
-                row_sec1 = row_sec1_obj.cells
-                row_sec1[0].merge(row_sec1[2])
-                row_sec1[0].text = "1. Hardware & Services Scope"
-                shade_cell(row_sec1[0], "E7E6E6")
-                row_sec1[0].paragraphs[0].runs[0].bold = True
-
-                def add_row(cat, qty, desc):
-                    r_obj = table_room.add_row()
-                    format_row(r_obj, 0.9)
-                    r = r_obj.cells
-                    r[0].text = cat
-                    r[1].text = str(qty)
-                    r[1].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-                    r[2].text = desc
-
-                # 1. VC BAR
-                add_row(pkg['vc'][0], 1, pkg['vc'][1])
-                
-                # 2. DISPLAY
-                disp_qty = 2 if "Dual" in r_type else 1
-                add_row(pkg['display'][0], disp_qty, pkg['display'][1])
-                
-                # 3. EXTRA ITEMS
-                for item in pkg['items']:
-                    add_row(item[0], item[3], item[1])
-                
-                # 4. MOUNT & CABLES
-                add_row(pkg['mount'][0], 1, pkg['mount'][1])
-                add_row(pkg['cables'][0], 1, pkg['cables'][1])
-
-                # 6. SERVICES (FIXED)
-                r_svc_obj = table_room.add_row()
-                format_row(r_svc_obj, 0.9)
-                r_svc = r_svc_obj.cells
-                r_svc[0].text = "Services"
-                r_svc[1].text = "1"
-                r_svc[1].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER 
-                r_svc[2].text = "Total Services (Staging, Installation, PM, Engineering)"
-
-                # --- MANAGED SERVICES ---
-                row_sec3_obj = table_room.add_row()
-                format_row(row_sec3_obj, 0.8)
-                row_sec3 = row_sec3_obj.cells
-                row_sec3[0].merge(row_sec3[2])
-                row_sec3[0].text = "2. Managed Services"
-                shade_cell(row_sec3[0], "E7E6E6")
-                row_sec3[0].paragraphs[0].runs[0].bold = True
-
-                r_msa_obj = table_room.add_row()
-                format_row(r_msa_obj, 0.9)
-                r_msa = r_msa_obj.cells
-                r_msa[0].text = "Support"
-                r_msa[1].text = "1"
-                r_msa[1].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER 
-                r_msa[2].text = "Managed Service Agreement - Year 1 (Annual Billing)"
-
-                # --- 4. AUDIO UPGRADE TABLE (Attached to Room if 98") ---
-                if 'audio_upgrade' in pkg:
-                    upg = pkg['audio_upgrade']
-                    # Separate header for upgrade
-                    r_upg_h = table_room.add_row()
-                    format_row(r_upg_h, 0.8)
-                    c_upg = r_upg_h.cells
-                    c_upg[0].merge(c_upg[2])
-                    c_upg[0].text = "3. Optional Upgrade: " + upg['name']
-                    shade_cell(c_upg[0], "FCE4D6") 
-                    c_upg[0].paragraphs[0].runs[0].bold = True
-                    
-                    for item_code, qty, desc, price in upg['items']:
-                        add_row(item_code, qty, desc)
-
-            # =========================================================
-            # MODE B: DATA#3 (CISCO) LOGIC
-            # =========================================================
-            else:
-                data = room['config']
-                
-                final_cisco_list = []
-                # Simple list processing for Data#3 items
-                for item in data['cisco_items']:
-                    if not item: continue
-                    final_cisco_list.append(item)
-
-                if final_cisco_list:
-                    row_sec1_obj = table_room.add_row()
-                    format_row(row_sec1_obj, 0.8)
-                    row_sec1 = row_sec1_obj.cells
-                    row_sec1[0].merge(row_sec1[2])
-                    row_sec1[0].text = "1. Data#3 Supply Scope (Cisco Hardware)"
-                    shade_cell(row_sec1[0], "E7E6E6")
-                    row_sec1[0].paragraphs[0].runs[0].bold = True
-
-                    for item in final_cisco_list:
-                        r_obj = table_room.add_row()
-                        format_row(r_obj, 0.9)
-                        r = r_obj.cells
-                        for cell in r: shade_cell(cell, "FFF2CC")
-                        r[0].text = "Video Conf"
-                        r[1].text = "1"
-                        r[1].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-                        r[2].text = item 
-
-                row_sec2_obj = table_room.add_row()
-                format_row(row_sec2_obj, 0.8)
-                row_sec2 = row_sec2_obj.cells
-                row_sec2[0].merge(row_sec2[2])
-                row_sec2[0].text = "2. Alder Technology Supply Scope"
-                shade_cell(row_sec2[0], "E7E6E6")
-                row_sec2[0].paragraphs[0].runs[0].bold = True
-
-                def add_spec_row(item_cat, qty, desc_text):
-                    r_obj = table_room.add_row()
-                    format_row(r_obj, 0.9)
-                    r = r_obj.cells
-                    r[0].text = item_cat
-                    r[1].text = str(qty)
-                    r[1].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-                    r[2].text = desc_text
-
-                add_spec_row("Visual Display", 1, data['display_model'])
-                add_spec_row("Mounting", 1, data['mount_model'])
-                add_spec_row("Cabling", 1, data['cables_misc'])
-                
-                r_svc_obj = table_room.add_row()
-                format_row(r_svc_obj, 0.9)
-                r_svc = r_svc_obj.cells
-                r_svc[0].text = "Services"
-                r_svc[1].text = "1"
-                r_svc[1].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER 
-                r_svc[2].text = "Professional Services: Installation, Staging & PM"
-
-                row_sec3_obj = table_room.add_row()
-                format_row(row_sec3_obj, 0.8)
-                row_sec3 = row_sec3_obj.cells
-                row_sec3[0].merge(row_sec3[2])
-                row_sec3[0].text = "3. Managed Services"
-                shade_cell(row_sec3[0], "E7E6E6")
-                row_sec3[0].paragraphs[0].runs[0].bold = True
-
-                r_msa_obj = table_room.add_row()
-                format_row(r_msa_obj, 0.9)
-                r_msa = r_msa_obj.cells
-                r_msa[0].text = "Support"
-                r_msa[1].text = "1"
-                r_msa[1].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER 
-                r_msa[2].text = "Managed Service Agreement - Year 1 (Annual Billing)"
-
-            doc.add_paragraph("")
+        add_manual_heading(doc, '2. Detailed Room Specifications', 16)
+
+        # --- ROOM SECTIONS (rendered in order, optionally across worker processes) ---
+        if stream is None:
+            stream = len(room_list) >= STREAM_MIN_ROOMS
+        streamed_sections = None
+        if stream:
+            # Rendered while saving - beyond the section cache, only one section is in memory at a time
+            doc.add_paragraph(ROOM_SECTIONS_MARKER)
+            streamed_sections = iter_room_section_xml(room_list, fitout_pkgs, table_style_id, block_width, max_workers, use_cache)
+        else:
+            render_room_sections(doc, room_list, fitout_pkgs, table_style_id, block_width, max_workers, use_cache)
 
         # ---------------------------------------------------------
         # FINAL SECTION
         # ---------------------------------------------------------
         doc.add_page_break()
-        add_manual_heading('Managed Service Agreement', 14)
+        add_manual_heading(doc, 'Managed Service Agreement', 14)
         
         msa_text = (
             "Pricing excludes GST and is charged annually with an increase each year of 4% or CPI whichever is the greater. "
             "Acceptance of a 60 month agreement upfront locks pricing for the five year term with no increase for CPI. "
             "Pricing includes all cloud monitoring hosting charges and any onsite support required."
         )
-        add_body_text(msa_text)
+        add_body_text(doc, msa_text)
+
+        # --- 5-YEAR SCHEDULE (Both billing options, CPI at or under the 4% floor) ---
+        projection = project_msa_schedules(pricing['ms_annual_cents'][pricing['valid']])
+        annual_sched = projection['annual_project'][0].tolist()
+        upfront_sched = projection['upfront_project'].tolist()
+
+        add_manual_heading(doc, 'Managed Service 5-Year Schedule', 12)
+
+        msa_rows = [table_row(0.9, [
+            table_cell(text, bold=True, align=WD_ALIGN_PARAGRAPH.CENTER, shade="D9E2F3")
+            for text in ("Contract Year", "Annual Billing\n(4% Minimum Increase)", "60 Month Upfront\n(Locked Pricing)")
+        ])]
+
+        for year in range(MSA_TERM_YEARS):
+            msa_rows.append(table_row(0.8, [
+                table_cell(f"Year {year + 1}"),
+                table_cell(f"${format_cents(annual_sched[year])}", align=WD_ALIGN_PARAGRAPH.RIGHT),
+                table_cell(f"${format_cents(upfront_sched[year])}", align=WD_ALIGN_PARAGRAPH.RIGHT),
+            ]))
 
-        add_manual_heading('Exclusions', 14)
+        msa_rows.append(table_row(0.8, [
+            table_cell("5 Year Total", bold=True, shade="E7E6E6"),
+            table_cell(f"${format_cents(projection['annual_total'][0])}", bold=True, align=WD_ALIGN_PARAGRAPH.RIGHT, shade="E7E6E6"),
+            table_cell(f"${format_cents(projection['upfront_total'])}", bold=True, align=WD_ALIGN_PARAGRAPH.RIGHT, shade="E7E6E6"),
+        ]))
+
+        add_table(msa_rows, auto_widths(3))
+
+        doc.add_paragraph("Annual billing assumes CPI does not exceed 4%. Higher CPI increases Years 2-5.")
+
+        add_manual_heading(doc, 'Exclusions', 14)
         
         # --- EXCLUSIONS TEXT ---
         exclusions_text = (
@@ -806,316 +2489,825 @@ try:
             "Quotes are valid for 30 days unless otherwise specified. Delays or pauses in works due to client delays or room unavailability may result in additional charges."
         )
         
-        add_body_text(exclusions_text)
+        add_body_text(doc, exclusions_text)
 
         doc.add_paragraph("\nThank you for your consideration. Please call me if you have any further queries.")
         doc.add_paragraph("Regards,")
         sig = doc.add_paragraph("George Coles")
         sig.runs[0].bold = True
 
-        desktop = os.path.expanduser("~/Desktop")
-        save_folder = os.path.join(desktop, "Alder_Quotes")
-        if not os.path.exists(save_folder):
-            os.makedirs(save_folder)
-
-        safe_client_name = "".join([c for c in client_name if c.isalpha() or c.isdigit() or c==' ']).rstrip()
-        timestamp = datetime.now().strftime("%H-%M-%S")
-        filename = f"Alder_Quote_{safe_client_name}_{project_mode[:4]}_{timestamp}.docx"
-        full_path = os.path.join(save_folder, filename)
-        
-        doc.save(full_path)
+        if streamed_sections is not None:
+            save_streamed_proposal(doc, full_path, streamed_sections)
+        else:
+            doc.save(full_path)
+        if cache_path:
+            store_cached_proposal(full_path, cache_path)
         return full_path
 
     # ==========================================
-    # PART 2: THE USER INTERFACE (GUI)
+    # PART 1L: HEADLESS BATCH GENERATION
     # ==========================================
 
-    ctk.set_appearance_mode("Light") 
-    ctk.set_default_color_theme("green") 
+    PROJECT_MODES = ("Data#3 (Cisco)", "Fit-Out (Full Scope)")
+    BATCH_WORKER = {} # Per worker process: the catalog handed over by init_batch_worker
 
-    app = ctk.CTk()
-    app.geometry("1200x800") 
-    app.title("Alder Technology - Quoting Tool")
-    
-    # Attempt to maximize window (Platform dependent)
-    try:
-        app.state('zoomed')
-    except:
-        app.after(0, lambda: app.wm_state('zoomed'))
-
-    # Enable HighDPI scaling
-    ctk.set_widget_scaling(1.0) 
-    
-    PRICELIST_DATA, FITOUT_PACKAGES_DYN, EXCEL_ERROR = load_internal_data()
-    ADDED_ROOMS = [] 
-    DROPDOWN_MAPPING = {}
-
-    # --- ASSETS ---
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    logo_path = os.path.join(script_dir, "alder_logo.png")
-    logo_image = None
-    if os.path.exists(logo_path):
+    def load_batch_manifest(path, default_mode=None):
+        """
+        Reads a batch manifest - one proposal per entry.
+        JSON: [{"client": ..., "mode": ..., "rooms": "rooms.csv" or [{"name": ..., "distance": ...}]}, ...]
+        CSV / text: one 'Client, Mode, Rooms File' per line (header optional).
+        Room files are survey files (see load_survey_file), relative to the manifest.
+        Returns a list of {'client', 'mode', 'rooms'} jobs; rooms is a path or a list of rooms.
+        """
+        base_dir = os.path.dirname(os.path.abspath(path))
+        entries = []
+        if path.lower().endswith(".json"):
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            for entry in (data.get('jobs', []) if isinstance(data, dict) else data):
+                entries.append((str(entry.get('client', "")).strip(), entry.get('mode') or default_mode, entry.get('rooms')))
+        else:
+            with open(path, encoding="utf-8-sig") as f:
+                for line in f:
+                    line = line.strip().replace("\t", ",")
+                    if not line or "," not in line: continue
+                    parts = [p.strip() for p in line.split(',')] + ["", ""]
+                    if parts[0].lower() == "client": continue # Header row
+                    entries.append((parts[0], parts[1] or default_mode, parts[2]))
+
+        jobs, problems = [], []
+        seen = {} # (file-safe client name, mode) -> client as listed
+        for number, (client, mode, rooms) in enumerate(entries, start=1):
+            # Output names are file-safe client + mode + time, so a clash would overwrite the first
+            name_key = (safe_client_name(client), mode)
+            if not client:
+                problems.append(f"entry {number}: missing client")
+            elif mode not in PROJECT_MODES:
+                problems.append(f"{client}: unknown mode {mode!r}")
+            elif not rooms:
+                problems.append(f"{client}: no rooms")
+            elif not isinstance(rooms, (list, str)):
+                problems.append(f"{client}: rooms must be a room file or a list of rooms")
+            elif name_key in seen:
+                other = seen[name_key]
+                problems.append(f"{client}: listed twice for {mode}" if other == client
+                                else f"{client}: same file name as {other} for {mode}")
+            else:
+                seen[name_key] = client
+                if isinstance(rooms, list):
+                    room_list = []
+                    for room_number, room in enumerate(rooms, start=1):
+                        if not isinstance(room, dict) or 'name' not in room or 'distance' not in room:
+                            problems.append(f"{client}: room {room_number} needs a name and distance")
+                            continue
+                        try:
+                            distance = float(str(room['distance']).lower().replace('m', ''))
+                        except ValueError:
+                            problems.append(f"{client}: room {room_number} distance {room['distance']!r} is not a number")
+                            continue
+                        room_list.append({"name": str(room['name']), "distance": distance})
+                    rooms = room_list
+                else:
+                    rooms = os.path.join(base_dir, rooms)
+                jobs.append({"client": client, "mode": mode, "rooms": rooms})
+        if problems:
+            raise ValueError("Bad manifest - " + "; ".join(problems))
+        if not jobs:
+            raise ValueError(f"No proposals listed in {os.path.basename(path)}")
+        return jobs
+
+    def init_batch_worker(catalog):
+        # Pool initializer: keep the catalog and warm the template cache once per process
+        BATCH_WORKER['catalog'] = catalog
+        for project_mode in PROJECT_MODES:
+            template_path = proposal_template_path(project_mode)
+            if os.path.exists(template_path):
+                load_template(template_path)
+
+    def run_batch_job(job):
+        """
+        Process-pool worker: generates one manifest entry's proposal into job['save_folder'].
+        Failures are returned rather than raised so the rest of the batch carries on.
+        """
+        started = time.perf_counter()
+        result = {"client": job['client'], "mode": job['mode'], "rooms": 0, "path": None, "error": None}
         try:
-            pil_image = Image.open(logo_path)
-            logo_image = ctk.CTkImage(light_image=pil_image, dark_image=pil_image, size=(280, 100)) 
-        except: pass
-
-    # --- FUNCTIONS ---
-    def refresh_room_list():
-        for widget in scroll_frame.winfo_children():
-            widget.destroy()
+            catalog = BATCH_WORKER['catalog']
+            survey = job['rooms'] if isinstance(job['rooms'], list) else load_survey_file(job['rooms'])
+            rooms, rejected = make_room_entries(catalog, job['mode'], [r['name'] for r in survey], [r['distance'] for r in survey])
+            if rejected:
+                more = f" and {len(rejected) - 10} more" if len(rejected) > 10 else ""
+                raise ValueError(f"No tier covers {', '.join(rejected[:10])}{more}")
+            if not rooms:
+                raise ValueError("No rooms in room list")
+            result['rooms'] = len(rooms)
+            # One process per proposal already keeps every core busy - render sections in-process
+            result['path'] = generate_multi_room_proposal(job['client'], rooms, job['mode'], catalog['fitout_packages'],
+                                                          catalog['version'], max_workers=1, save_folder=job['save_folder'])
+        except Exception as e:
+            result['error'] = f"{type(e).__name__}: {e}"
+        result['seconds'] = time.perf_counter() - started
+        return result
 
-        if not ADDED_ROOMS:
-            ctk.CTkLabel(scroll_frame, text="No rooms added yet.", text_color="gray", font=("Arial", 14)).pack(pady=40)
+    def run_batch(jobs, catalog, save_folder, max_workers=None):
+        """
+        Generates every job's proposal, across worker processes when there is more than one.
+        Yields per-job results in manifest order as they complete.
+        """
+        jobs = [dict(job, save_folder=save_folder) for job in jobs]
+        workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+        if workers < 2:
+            init_batch_worker(catalog)
+            for job in jobs:
+                yield run_batch_job(job)
             return
 
-        for index, room in enumerate(ADDED_ROOMS):
-            # Card Frame
-            card = ctk.CTkFrame(scroll_frame, fg_color="white", border_width=1, border_color="#E0E0E0", corner_radius=8)
-            card.pack(fill="x", pady=5, padx=5)
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_batch_worker, initargs=(catalog,)) as pool:
+            yield from pool.map(run_batch_job, jobs)
 
-            # Icon/Type
-            if "Fit-Out" in room['type']:
-                icon = "📦"
-                type_color = "#1F4E79"
-            else:
-                icon = "🔌"
-                type_color = "#009A44"
+    # ==========================================
+    # PART 2: COMMAND LINE TOOLS
+    # ==========================================
 
-            # Content Layout
-            # Left: Name & Type
-            info_frame = ctk.CTkFrame(card, fg_color="transparent")
-            info_frame.pack(side="left", padx=15, pady=10)
-            
-            ctk.CTkLabel(info_frame, text=room['name'], font=("Arial", 16, "bold"), text_color="#333").pack(anchor="w")
-            ctk.CTkLabel(info_frame, text=f"{icon} {room['type']}", font=("Arial", 12), text_color=type_color).pack(anchor="w")
-
-            # Right: Delete Button
-            btn_del = ctk.CTkButton(
-                card, text="Remove", width=80, height=30,
-                fg_color="#FFEEEE", text_color="#FF5555", hover_color="#FFDDDD",
-                font=("Arial", 12, "bold"),
-                command=lambda i=index: delete_room(i)
-            )
-            btn_del.pack(side="right", padx=15)
+    def cmd_compare(args):
+        names, distances = load_room_file(args.rooms)
+        result = compare_catalogs(distances, args.catalogs, args.mode, args.workers)
+
+        print(f"{len(names)} rooms priced against {len(args.catalogs)} catalogs ({args.mode})\n")
+        print(f"{'Catalog':<40}{'Upfront':>16}{'MS p/a':>14}{'Year 1':>16}{'vs First':>12}")
+        base = result['matrix'][0][2]
+        for source, (upfront, ms, y1) in zip(result['sources'], result['matrix'].tolist()):
+            delta = f"{(y1 - base) / base * 100:+.1f}%" if base else "n/a"
+            print(f"{os.path.basename(source):<40}{format_cents(upfront):>16}{format_cents(ms):>14}{format_cents(y1):>16}{delta:>12}")
+
+        for r in result['results']:
+            missing = [n for n, key in zip(names, r['tier_keys']) if key is None]
+            if missing:
+                print(f"  {os.path.basename(r['source'])}: no tier covers {', '.join(missing)} (priced at $0)")
+
+        if args.per_room:
+            print("\nPer-room Year 1 change vs first catalog:")
+            for i, name in enumerate(names):
+                deltas = "  ".join(f"{format_cents(d):>12}" for d in result['per_room_delta'][:, i].tolist())
+                print(f"{name:<30}{deltas}")
+        return 0
+
+    def cmd_solve(args):
+        catalog = load_catalog_file(args.catalog) if args.catalog else compile_catalog(*load_catalog_source()[:2])
+        survey = load_survey_file(args.rooms)
+        started = time.perf_counter()
+        solution = solve_tier_assignment(
+            catalog, args.mode,
+            [r['distance'] for r in survey],
+            [r['acoustic_risk'] for r in survey],
+            [r['dual_screen'] for r in survey],
+            args.max_models,
+        )
+        elapsed = time.perf_counter() - started
+
+        print(f"{len(survey)} rooms, {solution['classes']} requirement classes ({args.mode}) - solved in {elapsed:.3f}s")
+        limit = f"at most {args.max_models}" if args.max_models else "no limit"
+        note = "" if solution['optimal'] else " (search budget reached - best found)"
+        print(f"Display models ({limit}): {', '.join(solution['display_models'])}{note}\n")
+
+        print(f"{'Tier':<40}{'Rooms':>8}{'Year 1':>16}")
+        keys = solution['tier_keys']
+        for key in get_tier_band(catalog['tier_index'], args.mode)['keys']:
+            picked = [i for i, k in enumerate(keys) if k == key]
+            if picked:
+                print(f"{key:<40}{len(picked):>8}{format_cents(solution['y1_cents'][picked].sum()):>16}")
+
+        print(f"\nYear 1 total: ${format_cents(solution['total_cents'])} "
+              f"(incl. ${format_cents(solution['audio_cents'].sum())} audio options)")
+        if solution['total_cents'] != solution['unconstrained_total_cents']:
+            extra = solution['total_cents'] - solution['unconstrained_total_cents']
+            print(f"Standardisation cost: ${format_cents(extra)} over the unconstrained optimum")
+
+        missing = [r['name'] for r, k in zip(survey, keys) if k is None]
+        if missing:
+            more = f" and {len(missing) - 10} more" if len(missing) > 10 else ""
+            print(f"No compliant tier for {len(missing)} rooms: {', '.join(missing[:10])}{more}")
+
+        if args.per_room:
+            print()
+            for room, key, y1 in zip(survey, keys, solution['y1_cents'].tolist()):
+                print(f"{room['name']:<30}{room['distance']:>6.1f}m  {str(key):<36}{format_cents(y1):>14}")
+
+        if args.generate:
+            rooms, _ = make_solved_room_entries(catalog, args.mode, survey, solution)
+            if not rooms:
+                print("\nNo rooms could be assigned a tier - no proposal generated")
+                return 1
+            path = generate_multi_room_proposal(args.generate, rooms, args.mode, catalog['fitout_packages'],
+                                                catalog['version'], save_folder=args.out)
+            print(f"\nProposal for {len(rooms)} solved rooms: {path}")
+        return 0
+
+    def cmd_scopes(args):
+        catalog = load_catalog_file(args.catalog) if args.catalog else compile_catalog(*load_catalog_source()[:2])
+        survey = load_survey_file(args.rooms)
+        dual = price_dual_mode(catalog, [r['distance'] for r in survey], [2 if r['dual_screen'] else 1 for r in survey])
+
+        print(f"{len(survey)} rooms priced in both scopes\n")
+        print(f"{'Scope':<26}{'Rooms':>8}{'Upfront':>16}{'MS p/a':>14}{'Year 1':>16}")
+        for project_mode, pricing in dual.items():
+            print(f"{project_mode:<26}{int(pricing['valid'].sum()):>8}{format_cents(pricing['upfront_total_cents']):>16}"
+                  f"{format_cents(pricing['ms_total_cents']):>14}{format_cents(pricing['grand_total_cents']):>16}")
+
+        if args.per_room:
+            d3, fo = dual["Data#3 (Cisco)"], dual["Fit-Out (Full Scope)"]
+            print()
+            for i, room in enumerate(survey):
+                print(f"{room['name']:<30}{str(d3['tier_keys'][i]):<24}{format_cents(d3['total_y1_cents'][i]):>14}  "
+                      f"{str(fo['tier_keys'][i]):<16}{format_cents(fo['total_y1_cents'][i]):>14}")
+        return 0
+
+    def cmd_msa(args):
+        catalog = load_catalog_file(args.catalog) if args.catalog else compile_catalog(*load_catalog_source()[:2])
+        names, distances = load_room_file(args.rooms)
+        rooms, rejected = make_room_entries(catalog, args.mode, names, distances)
+        pricing = price_project(rooms, catalog['fitout_packages'], catalog['version'])
+        cpi_scenarios = [rate / 100 for rate in args.cpi]
+        projection = project_msa_schedules(pricing['ms_annual_cents'][pricing['valid']], cpi_scenarios)
+        priced = [room for room, ok in zip(rooms, pricing['valid'].tolist()) if ok]
+
+        years = "".join(f"{'Year ' + str(y + 1):>14}" for y in range(MSA_TERM_YEARS))
+        print(f"{len(priced)} rooms ({args.mode}) - managed service over {MSA_TERM_YEARS} years\n")
+        print(f"{'Billing':<28}{years}{'Total':>16}")
+        upfront = "".join(f"{format_cents(c):>14}" for c in projection['upfront_project'].tolist())
+        print(f"{'60 month upfront (locked)':<28}{upfront}{format_cents(projection['upfront_total']):>16}")
+        for s, rate in enumerate(args.cpi):
+            annual = "".join(f"{format_cents(c):>14}" for c in projection['annual_project'][s].tolist())
+            print(f"{f'Annual, CPI {rate:g}%':<28}{annual}{format_cents(projection['annual_total'][s]):>16}")
+
+        if args.per_room:
+            for s, rate in enumerate(args.cpi):
+                print(f"\nAnnual billing per room, CPI {rate:g}%")
+                schedules = room_msa_schedules(projection, s)
+                for room, schedule in zip(priced, schedules.tolist()):
+                    cells = "".join(f"{format_cents(c):>14}" for c in schedule)
+                    print(f"{room['name'][:27]:<28}{cells}{format_cents(sum(schedule)):>16}")
+
+        if rejected:
+            more = f" and {len(rejected) - 10} more" if len(rejected) > 10 else ""
+            print(f"\nNo tier covers {len(rejected)} rooms: {', '.join(rejected[:10])}{more}")
+        return 0
+
+    def format_change(old_cents, new_cents):
+        if old_cents is None or new_cents is None:
+            return ""
+        pct = percent_change(old_cents, new_cents)
+        delta = f"{pct:+.1f}%" if pct is not None else "new price"
+        return f"${format_cents(old_cents)} -> ${format_cents(new_cents)}  ({delta})"
+
+    def cmd_diff(args):
+        old_catalog, new_catalog = load_catalog_file(args.old), load_catalog_file(args.new)
+        report = diff_catalogs(old_catalog, new_catalog)
+        print(f"Catalog diff: {os.path.basename(args.old)} ({old_catalog['version']}) -> "
+              f"{os.path.basename(args.new)} ({new_catalog['version']})")
+
+        counts = {"added": 0, "removed": 0, "renamed": 0, "repriced": 0, "items": 0}
+        for project_mode, changes in report.items():
+            print(f"\n{project_mode}")
+            if not any(changes.values()):
+                print("  No changes")
+            for m in changes['matched']:
+                title = m['new_key']
+                if m['old_key'] != m['new_key']:
+                    title = f"{m['old_key']} -> {m['new_key']}  (renamed, {m['max_distance'][1]}m band)"
+                    counts['renamed'] += 1
+                print(f"  {title}")
+                if m['old_y1_cents'] != m['new_y1_cents']:
+                    counts['repriced'] += 1
+                    print(f"      Year 1: {format_change(m['old_y1_cents'], m['new_y1_cents'])}")
+                if m['max_distance'][0] != m['max_distance'][1]:
+                    print(f"      Max distance: {m['max_distance'][0]}m -> {m['max_distance'][1]}m")
+                counts['items'] += len(m['items'])
+                if args.items:
+                    for item in m['items']:
+                        desc = item['new_desc'] if item['kind'] == "added" else item['old_desc']
+                        if item['kind'] == "replaced":
+                            desc = f"{item['old_desc']} -> {item['new_desc']}"
+                        price = format_change(item['old_cents'], item['new_cents'])
+                        if item['kind'] in ("added", "removed"):
+                            cents = item['new_cents'] if item['kind'] == "added" else item['old_cents']
+                            price = f"${format_cents(cents)}" if cents is not None else ""
+                        print(f"      {item['kind']:<9}{item['category']}: {desc}  {price}".rstrip())
+            for key, y1 in changes['added']:
+                counts['added'] += 1
+                print(f"  + {key}  (Year 1 ${format_cents(y1)})")
+            for key, y1 in changes['removed']:
+                counts['removed'] += 1
+                print(f"  - {key}  (Year 1 ${format_cents(y1)})")
+
+        print(f"\n{counts['added']} added, {counts['removed']} removed, {counts['renamed']} renamed, "
+              f"{counts['repriced']} repriced packages; {counts['items']} item changes")
+        return 0
+
+    def cmd_find(args):
+        catalog = load_catalog_file(args.catalog) if args.catalog else compile_catalog(*load_catalog_source()[:2])
+        sku_index = catalog['sku_index']
+        match = "exact" if args.exact else "prefix" if args.prefix else "substring"
+
+        started = time.perf_counter()
+        line_ids = search_catalog(sku_index, args.query, match)
+        elapsed = (time.perf_counter() - started) * 1000
+
+        packages = {}
+        for line_id in line_ids:
+            mode, key, category, desc = sku_index['lines'][line_id]
+            packages.setdefault((mode, key), []).append(f"{category}: {desc}")
+
+        print(f"'{args.query}' ({match}): {len(line_ids)} lines in {len(packages)} packages "
+              f"[{elapsed:.3f}ms, {len(sku_index['tokens'])} indexed tokens]")
+        for (mode, key), descs in packages.items():
+            print(f"\n{key}  [{mode}]")
+            for desc in descs:
+                print(f"    {desc}")
+        return 0
+
+    def cmd_benchmark(args):
+        catalog = load_catalog_file(args.catalog) if args.catalog else compile_catalog(*load_catalog_source()[:2])
+        band = get_tier_band(catalog['tier_index'], args.mode)
+        # Cycle through every tier so each room section type is rendered
+        distances = [band['bounds'][i % len(band['bounds'])] for i in range(args.rooms)]
+        names = [f"Room {i + 1}" for i in range(args.rooms)]
+
+        timings = []
+        for _ in range(args.repeat):
+            rooms, _ = make_room_entries(catalog, args.mode, names, distances)
+            started = time.perf_counter()
+            path = generate_multi_room_proposal("Benchmark", rooms, args.mode, catalog['fitout_packages'], catalog['version'],
+                                                max_workers=args.workers, stream=args.stream, use_cache=False)
+            timings.append(time.perf_counter() - started)
+            os.remove(path)
+
+        best = min(timings)
+        print(f"{args.rooms} rooms ({args.mode}), best of {args.repeat}: "
+              f"{best:.2f}s total, {best / args.rooms * 1000:.2f}ms per room")
+        if not args.edit:
+            return 0
+
+        # --- INCREMENTAL REGENERATION (one room renamed) ---
+        # Unique client name, so the warm-up can't be answered by the output cache
+        client = f"Benchmark {datetime.now():%H-%M-%S-%f}"
+        rooms, _ = make_room_entries(catalog, args.mode, names, distances)
+        os.remove(generate_multi_room_proposal(client, rooms, args.mode, catalog['fitout_packages'], catalog['version'],
+                                               max_workers=args.workers, stream=args.stream))
+
+        edited = list(names)
+        edited[len(edited) // 2] += " (edited)"
+        rooms, _ = make_room_entries(catalog, args.mode, edited, distances)
+        before = SECTION_CACHE_STATS['rendered']
+        started = time.perf_counter()
+        os.remove(generate_multi_room_proposal(client, rooms, args.mode, catalog['fitout_packages'], catalog['version'],
+                                               max_workers=args.workers, stream=args.stream))
+        rendered = SECTION_CACHE_STATS['rendered'] - before
+        print(f"After editing one room: {time.perf_counter() - started:.2f}s, {rendered} of {args.rooms} sections rendered")
+        return 0 if rendered == 1 else 1
+
+    def cmd_batch(args):
+        try:
+            jobs = load_batch_manifest(args.manifest, args.mode)
+        except ValueError as e:
+            print(e)
+            return 1
+        catalog = load_catalog_file(args.catalog) if args.catalog else compile_catalog(*load_catalog_source()[:2])
+        save_folder = args.out or os.path.join(os.path.expanduser("~/Desktop"), "Alder_Quotes")
+        workers = min(args.workers or os.cpu_count() or 1, len(jobs)) or 1
+        print(f"{len(jobs)} proposals from {os.path.basename(args.manifest)} -> {save_folder} (workers: {workers})\n")
+
+        started = time.perf_counter()
+        failed = 0
+        for r in run_batch(jobs, catalog, save_folder, args.workers):
+            status = "FAILED" if r['error'] else "ok"
+            failed += bool(r['error'])
+            detail = r['error'] or os.path.basename(r['path'])
+            print(f"{status:<8}{r['client'][:30]:<32}{r['mode'][:7]:<9}{r['rooms']:>6} rooms{r['seconds']:>8.2f}s  {detail}")
+        elapsed = time.perf_counter() - started
+
+        print(f"\n{len(jobs) - failed} of {len(jobs)} proposals generated in {elapsed:.1f}s"
+              + (f" - {failed} failed" if failed else ""))
+        return 1 if failed else 0
+
+    def run_command_line(argv):
+        parser = argparse.ArgumentParser(prog="alder_quoter", description="Alder Technology quoting tool - command line")
+        sub = parser.add_subparsers(dest="command", required=True)
+
+        p = sub.add_parser("compare", help="Reprice one room list against several price lists")
+        p.add_argument("rooms", help="Room list (.csv 'Name, Distance' or .json)")
+        p.add_argument("catalogs", nargs="+", help="Quoter scripts (.py), pricelists (.xlsx) or snapshots (.cache)")
+        p.add_argument("--mode", default="Data#3 (Cisco)", choices=["Data#3 (Cisco)", "Fit-Out (Full Scope)"])
+        p.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per CPU)")
+        p.add_argument("--per-room", action="store_true", help="Also list per-room Year 1 deltas")
+        p.set_defaults(func=cmd_compare)
+
+        p = sub.add_parser("solve", help="Assign the cheapest compliant tier to every surveyed room")
+        p.add_argument("rooms", help="Survey (.csv 'Name, Distance, Acoustic Risk, Dual Screen' or .json)")
+        p.add_argument("--catalog", help="Price list to solve against (default: the one the GUI loads)")
+        p.add_argument("--mode", default="Data#3 (Cisco)", choices=["Data#3 (Cisco)", "Fit-Out (Full Scope)"])
+        p.add_argument("--max-models", type=int, default=None, help="Standardise on at most this many display models")
+        p.add_argument("--per-room", action="store_true", help="Also list each room's assigned tier")
+        p.add_argument("--generate", metavar="CLIENT", help="Also generate a proposal for this client from the solved rooms")
+        p.add_argument("--out", help="Proposal folder (default: Desktop/Alder_Quotes)")
+        p.set_defaults(func=cmd_solve)
+
+        p = sub.add_parser("scopes", help="Price a room list as Data#3 and as Fit-Out side by side")
+        p.add_argument("rooms", help="Survey (.csv 'Name, Distance[, Acoustic Risk, Dual Screen]' or .json)")
+        p.add_argument("--catalog", help="Price list to use (default: the one the GUI loads)")
+        p.add_argument("--per-room", action="store_true", help="Also list each room in both scopes")
+        p.set_defaults(func=cmd_scopes)
+
+        p = sub.add_parser("msa", help="Project the managed service cost over the term for several CPI scenarios")
+        p.add_argument("rooms", help="Room list (.csv 'Name, Distance' or .json)")
+        p.add_argument("--catalog", help="Price list to use (default: the one the GUI loads)")
+        p.add_argument("--mode", default="Data#3 (Cisco)", choices=PROJECT_MODES)
+        p.add_argument("--cpi", type=float, nargs="+", default=[0.0], metavar="PCT",
+                       help=f"CPI scenarios in %% (annual billing rises by the greater of CPI and {MSA_MIN_INCREASE:.0%})")
+        p.add_argument("--per-room", action="store_true", help="Also list each room's annual billing schedule")
+        p.set_defaults(func=cmd_msa)
+
+        p = sub.add_parser("diff", help="Show what changed between two price lists")
+        p.add_argument("old", help="Older catalog (.py, .xlsx or .cache)")
+        p.add_argument("new", help="Newer catalog (.py, .xlsx or .cache)")
+        p.add_argument("--items", action="store_true", help="List item-level changes under each package")
+        p.set_defaults(func=cmd_diff)
+
+        p = sub.add_parser("find", help="Find the tiers and quote lines containing a part number or model")
+        p.add_argument("query", help="e.g. CS-MIC-CLGPRO=  or  \"LG 98UM5K\"")
+        p.add_argument("--catalog", help="Price list to search (default: the one the GUI loads)")
+        p.add_argument("--prefix", action="store_true", help="Match terms as prefixes")
+        p.add_argument("--exact", action="store_true", help="Match whole tokens only")
+        p.set_defaults(func=cmd_find)
+
+        p = sub.add_parser("benchmark", help="Time proposal generation for a large synthetic project")
+        p.add_argument("--rooms", type=int, default=500)
+        p.add_argument("--mode", default="Data#3 (Cisco)", choices=["Data#3 (Cisco)", "Fit-Out (Full Scope)"])
+        p.add_argument("--catalog", help="Price list to use (default: the one the GUI loads)")
+        p.add_argument("--repeat", type=int, default=3, help="Runs to take the best time from")
+        p.add_argument("--workers", type=int, default=None, help=f"Room section render processes (default: one per CPU from {PARALLEL_RENDER_MIN_ROOMS} rooms, 1 = in-process)")
+        p.add_argument("--stream", action=argparse.BooleanOptionalAction, default=None,
+                       help=f"Stream room sections into the saved file (default: from {STREAM_MIN_ROOMS} rooms)")
+        p.add_argument("--edit", action="store_true",
+                       help="Also regenerate after renaming one room; fails unless only that room is re-rendered")
+        p.set_defaults(func=cmd_benchmark)
+
+        p = sub.add_parser("batch", help="Generate every proposal listed in a manifest")
+        p.add_argument("manifest", help="Manifest (.json, or .csv 'Client, Mode, Rooms File')")
+        p.add_argument("--mode", choices=PROJECT_MODES, help="Mode for entries that don't give one")
+        p.add_argument("--catalog", help="Price list to use (default: the one the GUI loads)")
+        p.add_argument("--out", help="Output folder (default: Desktop/Alder_Quotes)")
+        p.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per CPU)")
+        p.set_defaults(func=cmd_batch)
+
+        args = parser.parse_args(argv)
+        return args.func(args)
+
+    # ==========================================
+    # PART 3: THE USER INTERFACE (GUI)
+    # ==========================================
 
-        # Update Count
-        lbl_count.configure(text=f"Total Rooms: {len(ADDED_ROOMS)}")
+    # Worker processes re-import this script - only the real launch builds the GUI
+    if __name__ == "__main__":
+        multiprocessing.freeze_support()
+        if len(sys.argv) > 1:
+            sys.exit(run_command_line(sys.argv[1:]))
 
-    def delete_room(index):
-        del ADDED_ROOMS[index]
-        refresh_room_list()
+        ctk.set_appearance_mode("Light") 
+        ctk.set_default_color_theme("green") 
+
+        app = ctk.CTk()
+        app.geometry("1200x800") 
+        app.title("Alder Technology - Quoting Tool")
     
-    def on_dropdown_change(selected_val):
-        if "(" in selected_val:
-            suggested = selected_val.split("(")[0].strip()
-        else:
-            suggested = selected_val
-        current = entry_room_name.get()
-        if not current:
-            entry_room_name.insert(0, suggested)
+        # Attempt to maximize window (Platform dependent)
+        try:
+            app.state('zoomed')
+        except:
+            app.after(0, lambda: app.wm_state('zoomed'))
 
-    def update_dropdown_options(choice):
-        global DROPDOWN_MAPPING
+        # Enable HighDPI scaling
+        ctk.set_widget_scaling(1.0) 
+    
+        PRICELIST_DATA, FITOUT_PACKAGES_DYN, EXCEL_ERROR = load_catalog_source()
+        CATALOG = compile_catalog(PRICELIST_DATA, FITOUT_PACKAGES_DYN)
+        CATALOG_UPDATES = queue.Queue() # Filled by the catalog watcher thread
+        PROJECT_TOTALS = new_project_totals(CATALOG['version'])
+        ADDED_ROOMS = [] 
         DROPDOWN_MAPPING = {}
-        display_options = []
 
-        if choice == "Data#3 (Cisco)":
-            sorted_tiers = sorted([t for t in PRICELIST_DATA], key=lambda x: x['max_distance'])
-            prev_dist = 0 
+        # --- ASSETS ---
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        logo_path = os.path.join(script_dir, "alder_logo.png")
+        logo_image = None
+        if os.path.exists(logo_path):
+            try:
+                pil_image = Image.open(logo_path)
+                logo_image = ctk.CTkImage(light_image=pil_image, dark_image=pil_image, size=(280, 100)) 
+            except: pass
+
+        # --- FUNCTIONS ---
+        def refresh_room_list():
+            for widget in scroll_frame.winfo_children():
+                widget.destroy()
 
-            for tier in sorted_tiers:
-                curr = tier['max_distance']
-                
-                # Extract screen size from tier name
-                name_part = tier['tier_name']
-                screen_size = "Unknown"
-                if "(" in name_part and ")" in name_part:
-                    screen_size = name_part.split("(")[1].split(")")[0]
-                elif "55" in name_part: screen_size = "55\""
-                elif "65" in name_part: screen_size = "65\""
-                elif "75" in name_part: screen_size = "75\""
-                elif "86" in name_part: screen_size = "86\""
-                elif "98" in name_part: screen_size = "98\""
-
-                # NEW LABEL FORMAT: "0m - 3.0m Dist - 55" Screen"
-                label = f"{prev_dist}m - {curr}m Dist - {screen_size} Screen"
-                
-                display_options.append(label)
-                DROPDOWN_MAPPING[label] = tier
-                prev_dist = curr # Update prev_dist for the next iteration
-        else: # Fit-Out (Full Scope)
-            if FITOUT_PACKAGES_DYN:
-                pkg_list = []
-                for k, v in FITOUT_PACKAGES_DYN.items():
-                    pkg_list.append((k, v))
-                pkg_list.sort(key=lambda x: x[1]['max_distance'])
-                prev_dist = 0 
-
-                for name, data in pkg_list:
-                    curr = data['max_distance']
-                    
-                    # Extract screen size from package name
-                    screen_size = "Unknown"
-                    if "55" in name: screen_size = "55\""
-                    elif "65" in name: screen_size = "65\""
-                    elif "75" in name: screen_size = "75\""
-                    elif "86" in name: screen_size = "86\""
-                    elif "98" in name: screen_size = "98\""
-
-                    # Apply the same range formatting
-                    label = f"{prev_dist}m - {curr}m Dist - {screen_size} Screen"
-
-                    display_options.append(label)
-                    DROPDOWN_MAPPING[label] = name 
-                    prev_dist = curr
-            else:
-                display_options = ["No Packages"]
+            if not ADDED_ROOMS:
+                ctk.CTkLabel(scroll_frame, text="No rooms added yet.", text_color="gray", font=("Arial", 14)).pack(pady=40)
+                return
+
+            for index, room in enumerate(ADDED_ROOMS):
+                # Card Frame
+                card = ctk.CTkFrame(scroll_frame, fg_color="white", border_width=1, border_color="#E0E0E0", corner_radius=8)
+                card.pack(fill="x", pady=5, padx=5)
+
+                # Icon/Type
+                if "Fit-Out" in room['type']:
+                    icon = "📦"
+                    type_color = "#1F4E79"
+                else:
+                    icon = "🔌"
+                    type_color = "#009A44"
+
+                # Content Layout
+                # Left: Name & Type
+                info_frame = ctk.CTkFrame(card, fg_color="transparent")
+                info_frame.pack(side="left", padx=15, pady=10)
             
-        dropdown_type.configure(values=display_options)
-        dropdown_type.set(display_options[0] if display_options else "")
-        if display_options: on_dropdown_change(display_options[0]) # Update room name entry based on first option
+                ctk.CTkLabel(info_frame, text=room['name'], font=("Arial", 16, "bold"), text_color="#333").pack(anchor="w")
+                ctk.CTkLabel(info_frame, text=f"{icon} {room['type']}", font=("Arial", 12), text_color=type_color).pack(anchor="w")
+
+                # Right: Delete Button
+                btn_del = ctk.CTkButton(
+                    card, text="Remove", width=80, height=30,
+                    fg_color="#FFEEEE", text_color="#FF5555", hover_color="#FFDDDD",
+                    font=("Arial", 12, "bold"),
+                    command=lambda i=index: delete_room(i)
+                )
+                btn_del.pack(side="right", padx=15)
+
+                # Price preview (shares the rollup cache with the proposal summary)
+                package_id, tier = resolve_room_package(room, FITOUT_PACKAGES_DYN)
+                if tier:
+                    rollup = get_package_rollup(package_id, tier, room_display_qty(room), CATALOG['version'])
+                    preview = f"${format_cents(rollup['upfront_cents'], 0)} upfront + ${format_cents(rollup['ms_annual_cents'], 0)} p/a"
+                    ctk.CTkLabel(card, text=preview, font=("Arial", 12), text_color="#555").pack(side="right", padx=15)
+
+            # Update Count
+            lbl_count.configure(text=f"Total Rooms: {len(ADDED_ROOMS)}")
+
+        def update_totals_label():
+            t = PROJECT_TOTALS
+            lbl_totals.configure(text=(
+                f"Upfront ${format_cents(t['upfront_cents'], 0)}  |  Managed Service ${format_cents(t['ms_annual_cents'], 0)} p/a  |  "
+                f"Year 1 ${format_cents(t['upfront_cents'] + t['ms_annual_cents'])}  |  Panels {t['booking_panels']}  |  Audio Options {t['audio_upgrades']}"
+            ))
+
+        def delete_room(index):
+            remove_room_from_totals(PROJECT_TOTALS, ADDED_ROOMS.pop(index))
+            update_totals_label()
+            refresh_room_list()
+    
+        def on_dropdown_change(selected_val):
+            if "(" in selected_val:
+                suggested = selected_val.split("(")[0].strip()
+            else:
+                suggested = selected_val
+            current = entry_room_name.get()
+            if not current:
+                entry_room_name.insert(0, suggested)
 
-    def on_add_room():
-        r_name = entry_room_name.get().strip()
-        label = dropdown_type.get()
-        mode = dropdown_project_mode.get()
+        def update_dropdown_options(choice):
+            global DROPDOWN_MAPPING
+            DROPDOWN_MAPPING = {}
+            display_options = []
 
-        if not r_name:
-            status_bar.configure(text="Error: Missing Room Name", text_color="#FF5555")
-            return
+            band = get_tier_band(CATALOG['tier_index'], choice)
+            prev_dist = 0
 
-        mapped = DROPDOWN_MAPPING.get(label)
-        if not mapped: return
-        
-        if mode == "Data#3 (Cisco)":
-             dist = mapped['max_distance']
-        else:
-             pkg = FITOUT_PACKAGES_DYN.get(mapped)
-             dist = pkg['max_distance'] if pkg else 0.0
+            for key, tier, screen_size in zip(band['keys'], band['tiers'], band['screen_sizes']):
+                # LABEL FORMAT: "0m - 3.0m Dist - 55" Screen"
+                label = f"{prev_dist}m - {tier['max_distance']}m Dist - {screen_size} Screen"
 
-        room_entry = {'name': r_name, 'distance': dist}
+                display_options.append(label)
+                # Data#3 maps to the tier dict, Fit-Out maps to the package key
+                DROPDOWN_MAPPING[label] = tier if choice == "Data#3 (Cisco)" else key
+                prev_dist = tier['max_distance']
 
-        if mode == "Data#3 (Cisco)":
-            room_entry['type'] = mapped['tier_name']
-            room_entry['config'] = mapped
-        else:
-            room_entry['type'] = label
-            room_entry['pkg_key'] = mapped
-            room_entry['config'] = None
-        
-        ADDED_ROOMS.append(room_entry)
-        entry_room_name.delete(0, "end")
-        on_dropdown_change(dropdown_type.get())
-        refresh_room_list()
-        status_bar.configure(text="Room Added Successfully", text_color="green")
-
-    def on_generate_click():
-        status_bar.configure(text="Generating Proposal...", text_color="blue")
-        app.update()
-        client = entry_client.get().strip()
-        if not client:
-            status_bar.configure(text="Error: Enter Client Name", text_color="red")
-            return
-        if not ADDED_ROOMS:
-            status_bar.configure(text="Error: No rooms added", text_color="red")
-            return
+            if not display_options and choice != "Data#3 (Cisco)":
+                display_options = ["No Packages"]
 
-        try:
-            fp = generate_multi_room_proposal(client, ADDED_ROOMS, dropdown_project_mode.get(), FITOUT_PACKAGES_DYN)
-            status_bar.configure(text=f"Success! Saved to Desktop/Alder_Quotes", text_color="#009A44")
-            try: os.startfile(os.path.dirname(fp))
-            except: pass
-        except Exception as e:
-            status_bar.configure(text=f"Error: {str(e)}", text_color="red")
+            dropdown_type.configure(values=display_options)
+            dropdown_type.set(display_options[0] if display_options else "")
+            if display_options: on_dropdown_change(display_options[0]) # Update room name entry based on first option
+
+        def on_add_room():
+            r_name = entry_room_name.get().strip()
+            label = dropdown_type.get()
+            mode = dropdown_project_mode.get()
+            typed_dist = entry_distance.get().lower().replace('m', '').strip()
+
+            if not r_name:
+                status_bar.configure(text="Error: Missing Room Name", text_color="#FF5555")
+                return
+
+            if typed_dist:
+                # Measured distance entered - resolve the tier directly from the index
+                try:
+                    dist = float(typed_dist)
+                except ValueError:
+                    status_bar.configure(text="Error: Distance must be a number", text_color="#FF5555")
+                    return
+                key, tier = lookup_tier(CATALOG['tier_index'], mode, dist)
+                if tier is None:
+                    status_bar.configure(text=f"Error: No tier covers {dist}m", text_color="#FF5555")
+                    return
+            else:
+                mapped = DROPDOWN_MAPPING.get(label)
+                if not mapped: return
 
-    # --- LAYOUT CONSTRUCTION (GRID) ---
-    app.grid_columnconfigure(0, weight=0, minsize=350) # Sidebar
-    app.grid_columnconfigure(1, weight=1) # Main Content
-    app.grid_rowconfigure(0, weight=1) # Full Height
+                if mode == "Data#3 (Cisco)":
+                    key, tier = mapped['tier_name'], mapped
+                else:
+                    key, tier = mapped, FITOUT_PACKAGES_DYN.get(mapped)
+                dist = tier['max_distance'] if tier else 0.0
+
+            room_entry = make_room_entry(mode, r_name, dist, key, tier)
+
+            ADDED_ROOMS.append(room_entry)
+            add_room_to_totals(PROJECT_TOTALS, room_entry, FITOUT_PACKAGES_DYN)
+            update_totals_label()
+            entry_room_name.delete(0, "end")
+            entry_distance.delete(0, "end")
+            on_dropdown_change(dropdown_type.get())
+            refresh_room_list()
+            status_bar.configure(text="Room Added Successfully", text_color="green")
+
+        def on_generate_click():
+            status_bar.configure(text="Generating Proposal...", text_color="blue")
+            app.update()
+            client = entry_client.get().strip()
+            if not client:
+                status_bar.configure(text="Error: Enter Client Name", text_color="red")
+                return
+            if not ADDED_ROOMS:
+                status_bar.configure(text="Error: No rooms added", text_color="red")
+                return
 
-    # 1. SIDEBAR (Left)
-    sidebar = ctk.CTkFrame(app, fg_color="#F9F9F9", corner_radius=0, width=350)
-    sidebar.grid(row=0, column=0, sticky="nsew")
-    
-    # Logo Area
-    if logo_image:
-        # In a PyInstaller bundle, the image might be extracted to a temp folder
-        if getattr(sys, 'frozen', False): # Check if running as a bundled executable
-            bundle_dir = sys._MEIPASS
-            logo_path = os.path.join(bundle_dir, "alder_logo.png")
-        else:
-            logo_path = os.path.join(script_dir, "alder_logo.png")
+            try:
+                compare_catalog = CATALOG if chk_compare.get() else None
+                fp = generate_multi_room_proposal(client, ADDED_ROOMS, dropdown_project_mode.get(), FITOUT_PACKAGES_DYN, CATALOG['version'], PROJECT_TOTALS,
+                                                  compare_catalog, max_workers=1)
+                status_bar.configure(text=f"Success! Saved to Desktop/Alder_Quotes", text_color="#009A44")
+                try: os.startfile(os.path.dirname(fp))
+                except: pass
+            except Exception as e:
+                status_bar.configure(text=f"Error: {str(e)}", text_color="red")
+
+        def apply_catalog_update(new_catalog, error):
+            """
+            Swaps a catalog rebuilt by the watcher thread into the running session (UI thread only).
+            """
+            global CATALOG, PRICELIST_DATA, FITOUT_PACKAGES_DYN, EXCEL_ERROR, PROJECT_TOTALS
+            if new_catalog is None:
+                status_bar.configure(text=f"Pricelist reload failed: {error}", text_color="#FF5555")
+                return
+            if new_catalog['version'] == CATALOG['version']:
+                return # Source was saved but no prices or descriptions changed
+
+            # Swap all references together so no callback sees a half-updated catalog
+            CATALOG, PRICELIST_DATA, FITOUT_PACKAGES_DYN, EXCEL_ERROR = (
+                new_catalog, new_catalog['pricelist_data'], new_catalog['fitout_packages'], error)
+
+            unmatched = [room['name'] for room in ADDED_ROOMS if not rebind_room(room, CATALOG)]
+            PROJECT_TOTALS = rebuild_project_totals(ADDED_ROOMS, FITOUT_PACKAGES_DYN, CATALOG['version'])
+            update_totals_label()
+
+            # Rebuild the dropdown but keep the user's current selection if it still exists
+            prev_label = dropdown_type.get()
+            update_dropdown_options(dropdown_project_mode.get())
+            if prev_label in DROPDOWN_MAPPING:
+                dropdown_type.set(prev_label)
+            refresh_room_list()
+
+            if unmatched:
+                status_bar.configure(text=f"Prices updated - no tier fits: {', '.join(unmatched)}", text_color="#FF5555")
+            else:
+                status_bar.configure(text=f"Prices updated ({datetime.now().strftime('%H:%M:%S')})", text_color="#009A44")
 
-        if os.path.exists(logo_path):
+        def poll_catalog_updates():
             try:
-                pil_image = Image.open(logo_path)
-                logo_image = ctk.CTkImage(light_image=pil_image, dark_image=pil_image, size=(280, 100)) 
-                ctk.CTkLabel(sidebar, image=logo_image, text="").pack(pady=(30, 20))
-            except Exception as img_e:
-                ctk.CTkLabel(sidebar, text=f"ALDER TECH (Logo Error: {img_e})", font=("Arial Black", 20), text_color="#009A44").pack(pady=(40, 20))
+                while True:
+                    apply_catalog_update(*CATALOG_UPDATES.get_nowait())
+            except queue.Empty:
+                pass
+            app.after(1000, poll_catalog_updates)
+
+        # --- LAYOUT CONSTRUCTION (GRID) ---
+        app.grid_columnconfigure(0, weight=0, minsize=350) # Sidebar
+        app.grid_columnconfigure(1, weight=1) # Main Content
+        app.grid_rowconfigure(0, weight=1) # Full Height
+
+        # 1. SIDEBAR (Left)
+        sidebar = ctk.CTkFrame(app, fg_color="#F9F9F9", corner_radius=0, width=350)
+        sidebar.grid(row=0, column=0, sticky="nsew")
+    
+        # Logo Area
+        if logo_image:
+            # In a PyInstaller bundle, the image might be extracted to a temp folder
+            if getattr(sys, 'frozen', False): # Check if running as a bundled executable
+                bundle_dir = sys._MEIPASS
+                logo_path = os.path.join(bundle_dir, "alder_logo.png")
+            else:
+                logo_path = os.path.join(script_dir, "alder_logo.png")
+
+            if os.path.exists(logo_path):
+                try:
+                    pil_image = Image.open(logo_path)
+                    logo_image = ctk.CTkImage(light_image=pil_image, dark_image=pil_image, size=(280, 100)) 
+                    ctk.CTkLabel(sidebar, image=logo_image, text="").pack(pady=(30, 20))
+                except Exception as img_e:
+                    ctk.CTkLabel(sidebar, text=f"ALDER TECH (Logo Error: {img_e})", font=("Arial Black", 20), text_color="#009A44").pack(pady=(40, 20))
+            else:
+                ctk.CTkLabel(sidebar, text="ALDER TECH", font=("Arial Black", 24), text_color="#009A44").pack(pady=(40, 20))
         else:
             ctk.CTkLabel(sidebar, text="ALDER TECH", font=("Arial Black", 24), text_color="#009A44").pack(pady=(40, 20))
-    else:
-        ctk.CTkLabel(sidebar, text="ALDER TECH", font=("Arial Black", 24), text_color="#009A44").pack(pady=(40, 20))
 
-    # Controls Container
-    ctrl_frame = ctk.CTkFrame(sidebar, fg_color="transparent")
-    ctrl_frame.pack(fill="x", padx=20)
+        # Controls Container
+        ctrl_frame = ctk.CTkFrame(sidebar, fg_color="transparent")
+        ctrl_frame.pack(fill="x", padx=20)
 
-    ctk.CTkLabel(ctrl_frame, text="Client Details", font=("Arial", 14, "bold"), text_color="#555").pack(anchor="w", pady=(10, 5))
-    entry_client = ctk.CTkEntry(ctrl_frame, placeholder_text="Client Name", height=40, font=("Arial", 14))
-    entry_client.pack(fill="x", pady=5)
+        ctk.CTkLabel(ctrl_frame, text="Client Details", font=("Arial", 14, "bold"), text_color="#555").pack(anchor="w", pady=(10, 5))
+        entry_client = ctk.CTkEntry(ctrl_frame, placeholder_text="Client Name", height=40, font=("Arial", 14))
+        entry_client.pack(fill="x", pady=5)
 
-    ctk.CTkLabel(ctrl_frame, text="Project Scope", font=("Arial", 14, "bold"), text_color="#555").pack(anchor="w", pady=(20, 5))
-    dropdown_project_mode = ctk.CTkOptionMenu(ctrl_frame, values=["Data#3 (Cisco)", "Fit-Out (Full Scope)"], height=40, font=("Arial", 13), fg_color="#333", command=update_dropdown_options)
-    dropdown_project_mode.pack(fill="x", pady=5)
+        ctk.CTkLabel(ctrl_frame, text="Project Scope", font=("Arial", 14, "bold"), text_color="#555").pack(anchor="w", pady=(20, 5))
+        dropdown_project_mode = ctk.CTkOptionMenu(ctrl_frame, values=["Data#3 (Cisco)", "Fit-Out (Full Scope)"], height=40, font=("Arial", 13), fg_color="#333", command=update_dropdown_options)
+        dropdown_project_mode.pack(fill="x", pady=5)
 
-    ctk.CTkFrame(ctrl_frame, height=2, fg_color="#E0E0E0").pack(fill="x", pady=30) # Divider
+        ctk.CTkFrame(ctrl_frame, height=2, fg_color="#E0E0E0").pack(fill="x", pady=30) # Divider
 
-    ctk.CTkLabel(ctrl_frame, text="Room Builder", font=("Arial", 16, "bold"), text_color="#009A44").pack(anchor="w", pady=(0, 10))
+        ctk.CTkLabel(ctrl_frame, text="Room Builder", font=("Arial", 16, "bold"), text_color="#009A44").pack(anchor="w", pady=(0, 10))
     
-    dropdown_type = ctk.CTkOptionMenu(ctrl_frame, values=[], height=40, fg_color="#1F4E79", font=("Arial", 13), command=on_dropdown_change)
-    dropdown_type.pack(fill="x", pady=5)
+        dropdown_type = ctk.CTkOptionMenu(ctrl_frame, values=[], height=40, fg_color="#1F4E79", font=("Arial", 13), command=on_dropdown_change)
+        dropdown_type.pack(fill="x", pady=5)
     
-    entry_room_name = ctk.CTkEntry(ctrl_frame, placeholder_text="Room Name", height=40, font=("Arial", 14))
-    entry_room_name.pack(fill="x", pady=5)
+        entry_room_name = ctk.CTkEntry(ctrl_frame, placeholder_text="Room Name", height=40, font=("Arial", 14))
+        entry_room_name.pack(fill="x", pady=5)
+
+        entry_distance = ctk.CTkEntry(ctrl_frame, placeholder_text="Measured Distance (m) - Optional", height=40, font=("Arial", 14))
+        entry_distance.pack(fill="x", pady=5)
 
-    btn_add = ctk.CTkButton(ctrl_frame, text="+ ADD ROOM", height=50, fg_color="#009A44", hover_color="#007a36", font=("Arial", 14, "bold"), command=on_add_room)
-    btn_add.pack(fill="x", pady=20)
+        btn_add = ctk.CTkButton(ctrl_frame, text="+ ADD ROOM", height=50, fg_color="#009A44", hover_color="#007a36", font=("Arial", 14, "bold"), command=on_add_room)
+        btn_add.pack(fill="x", pady=20)
 
-    # 2. MAIN DASHBOARD (Right)
-    main_area = ctk.CTkFrame(app, fg_color="white", corner_radius=0)
-    main_area.grid(row=0, column=1, sticky="nsew", padx=0, pady=0)
+        # 2. MAIN DASHBOARD (Right)
+        main_area = ctk.CTkFrame(app, fg_color="white", corner_radius=0)
+        main_area.grid(row=0, column=1, sticky="nsew", padx=0, pady=0)
     
-    # Header
-    top_bar = ctk.CTkFrame(main_area, height=80, fg_color="white")
-    top_bar.pack(fill="x", side="top")
-    ctk.CTkLabel(top_bar, text="Project Overview", font=("Arial", 28, "bold"), text_color="#333").pack(side="left", padx=40, pady=30)
-    lbl_count = ctk.CTkLabel(top_bar, text="Total Rooms: 0", font=("Arial", 14), text_color="gray")
-    lbl_count.pack(side="right", padx=40, pady=30)
-
-    # List Area
-    scroll_frame = ctk.CTkScrollableFrame(main_area, fg_color="#F4F4F4", corner_radius=0)
-    scroll_frame.pack(fill="both", expand=True, padx=40, pady=(0, 20))
-
-    # Bottom Action Area
-    action_bar = ctk.CTkFrame(main_area, height=100, fg_color="white")
-    action_bar.pack(fill="x", side="bottom", pady=0)
+        # Header
+        top_bar = ctk.CTkFrame(main_area, height=80, fg_color="white")
+        top_bar.pack(fill="x", side="top")
+        ctk.CTkLabel(top_bar, text="Project Overview", font=("Arial", 28, "bold"), text_color="#333").pack(side="left", padx=40, pady=30)
+        lbl_count = ctk.CTkLabel(top_bar, text="Total Rooms: 0", font=("Arial", 14), text_color="gray")
+        lbl_count.pack(side="right", padx=40, pady=30)
+
+        # Live project totals (kept up to date by on_add_room / delete_room)
+        lbl_totals = ctk.CTkLabel(main_area, text="", font=("Arial", 13, "bold"), text_color="#1F4E79", anchor="w")
+        lbl_totals.pack(fill="x", padx=40, pady=(0, 10))
+
+        # List Area
+        scroll_frame = ctk.CTkScrollableFrame(main_area, fg_color="#F4F4F4", corner_radius=0)
+        scroll_frame.pack(fill="both", expand=True, padx=40, pady=(0, 20))
+
+        # Bottom Action Area
+        action_bar = ctk.CTkFrame(main_area, height=100, fg_color="white")
+        action_bar.pack(fill="x", side="bottom", pady=0)
     
-    status_bar = ctk.CTkLabel(action_bar, text="Ready", font=("Arial", 12), text_color="gray", anchor="w")
-    status_bar.pack(side="left", padx=40)
+        status_bar = ctk.CTkLabel(action_bar, text="Ready", font=("Arial", 12), text_color="gray", anchor="w")
+        status_bar.pack(side="left", padx=40)
 
-    btn_gen = ctk.CTkButton(action_bar, text="GENERATE PROPOSAL", width=250, height=55, fg_color="#1F4E79", font=("Arial", 15, "bold"), command=on_generate_click)
-    btn_gen.pack(side="right", padx=40, pady=20)
+        btn_gen = ctk.CTkButton(action_bar, text="GENERATE PROPOSAL", width=250, height=55, fg_color="#1F4E79", font=("Arial", 15, "bold"), command=on_generate_click)
+        btn_gen.pack(side="right", padx=40, pady=20)
+
+        chk_compare = ctk.CTkCheckBox(action_bar, text="Include Data#3 vs Fit-Out comparison", font=("Arial", 12))
+        chk_compare.pack(side="right", padx=10)
+
+        # Init
+        update_dropdown_options("Data#3 (Cisco)")
+        refresh_room_list()
+        update_totals_label()
+        if EXCEL_ERROR:
+            status_bar.configure(text=f"Pricelist: {EXCEL_ERROR}", text_color="#FF5555")
 
-    # Init
-    update_dropdown_options("Data#3 (Cisco)")
-    refresh_room_list()
+        # Pick up price changes (Excel or edited tables) without restarting
+        start_catalog_watcher(CATALOG_UPDATES)
+        poll_catalog_updates()
 
-    app.mainloop()
+        app.mainloop()
 
 except Exception as e:
+    if __name__ == "__main__" and len(sys.argv) > 1:
+        raise # Command line runs report on the console, not a dialog
     root = tkinter.Tk()
     root.withdraw()
     msg = str(traceback.format_exc())
@@ -34,13 +34,22 @@ def create_master_pricelist():
         "Cables Price",       # I
         "Service Price",      # J
         "MS Annual Price",    # K
-        "Extra Items String"  # L (Format: Name|Cost|Qty; Name|Cost|Qty)
+        "Extra Items String"  # L (Legacy "Name|Cost|Qty; ..." format - extras now live on the Extras sheet)
     ]
 
     # 4. DATA
-    # Extras string format: "Item Name|Price|Qty ; Item Name|Price|Qty"
-    xl_extras_98 = "QSC Core Nano|3500|1; Sennheiser Ceiling Mic|3576|2; QSC Ceiling Spk|765|6; Netgear Switch|1427|1; Wall Mount 82-98|100|1"
-    xl_extras_86 = "QSC Core Nano|3500|1; Sennheiser Ceiling Mic|3576|2; QSC Ceiling Spk|765|6; Netgear Switch|1427|1; Wall Mount 82-98|100|1"
+    # Extras are typed rows: (Category, Item Name, Unit Cost, Qty)
+    xl_extras = [
+        ("Hardware", "QSC Core Nano", 3500, 1),
+        ("Hardware", "Sennheiser Ceiling Mic", 3576, 2),
+        ("Hardware", "QSC Ceiling Spk", 765, 6),
+        ("Hardware", "Netgear Switch", 1427, 1),
+        ("Hardware", "Wall Mount 82-98", 100, 1),
+    ]
+    extras_by_package = {
+        "Fit-Out XL (98 Single)": xl_extras,
+        "Fit-Out XL (86 Dual)": xl_extras,
+    }
 
     data = [
         # [Dist, Name, VC_Item, Disp_Model, Disp_Price, Mnt_Model, Mnt_Price, Cab_Desc, Cab_Price, Svc_Price, MS_Price, Extras]
@@ -56,20 +65,28 @@ def create_master_pricelist():
         [0.0, "Fit-Out 55", "Maxhub XBAR W70", "LG 55UL3J-B", 1100, "Venturi VP-F80", 65, "Custom Bundle", 300, 3000, 1200, ""],
         [0.0, "Fit-Out 65", "Maxhub XBAR W70", "LG 65UL3J-B", 1500, "Venturi VP-F80", 65, "Custom Bundle", 300, 3000, 1200, ""],
         [0.0, "Fit-Out 75", "Maxhub XBAR W70", "LG 75UL3J-B", 2200, "Venturi VP-F80", 65, "Custom Bundle", 300, 3000, 1200, ""],
-        [0.0, "Fit-Out XL (98 Single)", "Maxhub XBAR W70", "LG 98UM5K", 9000, "Included in Extras", 0, "Custom Bundle", 1090, 9000, 1500, xl_extras_98],
-        [0.0, "Fit-Out XL (86 Dual)", "Maxhub XBAR W70", "LG 86UL3J-B", 3300, "Included in Extras", 0, "Custom Bundle", 1090, 9500, 1500, xl_extras_86]
+        [0.0, "Fit-Out XL (98 Single)", "Maxhub XBAR W70", "LG 98UM5K", 9000, "Included in Extras", 0, "Custom Bundle", 1090, 9000, 1500, ""],
+        [0.0, "Fit-Out XL (86 Dual)", "Maxhub XBAR W70", "LG 86UL3J-B", 3300, "Included in Extras", 0, "Custom Bundle", 1090, 9500, 1500, ""]
     ]
 
     ws.append(headers)
     for row in data:
         ws.append(row)
 
+    # EXTRAS SHEET (One row per item, read by the quoter alongside the Pricelist)
+    ws_extras = wb.create_sheet("Extras")
+    ws_extras.append(["Package", "Category", "Item", "Unit Cost", "Qty"])
+    for package_name, items in extras_by_package.items():
+        for category, item_name, unit_cost, qty in items:
+            ws_extras.append([package_name, category, item_name, unit_cost, qty])
+
     # 5. STYLING
     header_fill = PatternFill(start_color="009A44", end_color="009A44", fill_type="solid")
-    for cell in ws[1]:
-        cell.font = Font(bold=True, color="FFFFFF")
-        cell.fill = header_fill
-        cell.alignment = Alignment(horizontal='center')
+    for sheet in (ws, ws_extras):
+        for cell in sheet[1]:
+            cell.font = Font(bold=True, color="FFFFFF")
+            cell.fill = header_fill
+            cell.alignment = Alignment(horizontal='center')
 
     # 6. SAVE
     try: